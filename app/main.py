@@ -1,19 +1,39 @@
 """FastAPI Application for EstateLink Tenancy Management System"""
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Depends, Query
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from jinja2 import FileSystemBytecodeCache
+import asyncio
+import logging
+import os
 import sys
 from pathlib import Path
 
 # Add parent directory to path to import tenancy_agent
 sys.path.append(str(Path(__file__).parent.parent))
 
-from tenancy_agent.database import SupabaseConnection
+from tenancy_agent.db_pool import get_conn, pooled_connection, warm_pool
+from tenancy_agent.cache import cached
+from tenancy_agent.http_cache import add_http_caching
 from tenancy_agent.contracts import fetch_contracts, get_alerts, get_contract_summary
 from tenancy_agent.checks import generate_checks, get_overdue_checks, get_upcoming_checks
+from tenancy_agent.statistics import get_dashboard_counts
 
-app = FastAPI(title="EstateLink Tenancy Management System")
+logger = logging.getLogger(__name__)
+
+# Seconds the dashboard counts are served from Redis
+DASHBOARD_CACHE_TTL = 30
+
+app = FastAPI(title="EstateLink Tenancy Management System", default_response_class=ORJSONResponse)
+
+# Browser/proxy caching for read-only pages (seconds)
+add_http_caching(app, {
+    "/contracts": 60,
+    "/expiring": 30,
+    "/payments/upcoming": 30,
+    "/payments/overdue": 30
+})
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -21,104 +41,104 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 # Setup templates
 templates = Jinja2Templates(directory="app/templates")
 
+# Compiled templates are kept on disk (set up at startup); skip per-render mtime checks
+JINJA_CACHE_DIR = Path(os.getenv("JINJA_CACHE_DIR", Path(__file__).parent / ".jinja_cache"))
+templates.env.auto_reload = False
+
+
+@app.on_event("startup")
+async def warm_connections():
+    """Open pooled database connections before the first request arrives"""
+    try:
+        await asyncio.to_thread(warm_pool)
+    except Exception as e:
+        logger.error(f"Connection pool warm-up failed: {str(e)}")
+
+
+@app.on_event("startup")
+async def preload_templates():
+    """Compile every template up front so first renders skip parsing"""
+    try:
+        JINJA_CACHE_DIR.mkdir(exist_ok=True)
+        templates.env.bytecode_cache = FileSystemBytecodeCache(directory=str(JINJA_CACHE_DIR))
+    except OSError as e:
+        logger.warning(f"Template bytecode cache disabled: {str(e)}")
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
+
 
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(request: Request):
+def dashboard(request: Request):
     """Main dashboard page"""
-    conn = SupabaseConnection()
+    def load():
+        # Only borrow a connection on a cache miss
+        with pooled_connection() as conn:
+            return get_dashboard_counts(conn, alert_days=100, days_ahead=30)
 
-    try:
-        contracts = fetch_contracts(conn)
-        alerts = get_alerts(conn, alert_days=100)
-        upcoming = get_upcoming_checks(conn, days_ahead=30)
-        overdue = get_overdue_checks(conn)
-
-        return templates.TemplateResponse("dashboard.html", {
-            "request": request,
-            "total_contracts": len(contracts),
-            "expiring_contracts": len(alerts),
-            "upcoming_payments": len(upcoming),
-            "overdue_payments": len(overdue)
-        })
-    finally:
-        conn.close()
+    counts = cached("dash:v1", DASHBOARD_CACHE_TTL, load)
+    return templates.TemplateResponse("dashboard.html", {"request": request, **counts})
 
 
 @app.get("/contracts", response_class=HTMLResponse)
-async def contracts_page(request: Request):
+def contracts_page(request: Request, limit: int = Query(50, ge=1, le=500),
+                   offset: int = Query(0, ge=0), conn=Depends(get_conn)):
     """Contracts listing page"""
-    conn = SupabaseConnection()
-
-    try:
-        contracts = fetch_contracts(conn)
-        return templates.TemplateResponse("contracts.html", {
-            "request": request,
-            "contracts": contracts
-        })
-    finally:
-        conn.close()
+    contracts = fetch_contracts(conn, limit=limit, offset=offset)
+    return templates.TemplateResponse("contracts.html", {
+        "request": request,
+        "contracts": contracts,
+        "limit": limit,
+        "offset": offset
+    })
 
 
 @app.get("/contracts/{contract_id}", response_class=HTMLResponse)
-async def contract_detail(request: Request, contract_id: int):
+def contract_detail(request: Request, contract_id: int, conn=Depends(get_conn)):
     """Contract detail page"""
-    conn = SupabaseConnection()
-
-    try:
-        contract = get_contract_summary(conn, contract_id)
-        return templates.TemplateResponse("contract_detail.html", {
-            "request": request,
-            "contract": contract
-        })
-    finally:
-        conn.close()
+    contract = get_contract_summary(conn, contract_id)
+    return templates.TemplateResponse("contract_detail.html", {
+        "request": request,
+        "contract": contract
+    })
 
 
 @app.get("/expiring", response_class=HTMLResponse)
-async def expiring_contracts(request: Request):
+def expiring_contracts(request: Request, conn=Depends(get_conn)):
     """Expiring contracts page"""
-    conn = SupabaseConnection()
-
-    try:
-        alerts = get_alerts(conn, alert_days=100)
-        return templates.TemplateResponse("expiring.html", {
-            "request": request,
-            "contracts": alerts
-        })
-    finally:
-        conn.close()
+    alerts = get_alerts(conn, alert_days=100)
+    return templates.TemplateResponse("expiring.html", {
+        "request": request,
+        "contracts": alerts
+    })
 
 
 @app.get("/payments/upcoming", response_class=HTMLResponse)
-async def upcoming_payments(request: Request):
+def upcoming_payments(request: Request, conn=Depends(get_conn)):
     """Upcoming payments page"""
-    conn = SupabaseConnection()
-
-    try:
-        upcoming = get_upcoming_checks(conn, days_ahead=30)
-        return templates.TemplateResponse("upcoming_payments.html", {
-            "request": request,
-            "checks": upcoming
-        })
-    finally:
-        conn.close()
+    upcoming = get_upcoming_checks(conn, days_ahead=30)
+    return templates.TemplateResponse("upcoming_payments.html", {
+        "request": request,
+        "checks": upcoming
+    })
 
 
 @app.get("/payments/overdue", response_class=HTMLResponse)
-async def overdue_payments(request: Request):
+def overdue_payments(request: Request, conn=Depends(get_conn)):
     """Overdue payments page"""
-    conn = SupabaseConnection()
-
-    try:
-        overdue = get_overdue_checks(conn)
-        return templates.TemplateResponse("overdue_payments.html", {
-            "request": request,
-            "checks": overdue
-        })
-    finally:
-        conn.close()
+    overdue = get_overdue_checks(conn)
+    return templates.TemplateResponse("overdue_payments.html", {
+        "request": request,
+        "checks": overdue
+    })
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "4")),
+        loop="uvloop",
+        http="httptools"
+    )
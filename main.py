@@ -3,14 +3,16 @@ EstateLink FastAPI Application
 Production-ready API endpoints for tenancy management
 """
 
-from fastapi import FastAPI, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from contextlib import contextmanager
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, EmailStr, Field
 from datetime import date, datetime
+import orjson
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError
 import os
 from dotenv import load_dotenv
 
@@ -26,23 +28,32 @@ from tenancy_agent.tenancy_agent import (
     get_upcoming_checks,
     get_contract_summary
 )
+from tenancy_agent.contracts import iter_contracts
+from tenancy_agent.db_pool import pooled_connection
+from tenancy_agent.cache import cached, json_default
+from tenancy_agent.http_cache import add_http_caching
 
 # Initialize FastAPI app
 app = FastAPI(
     title="EstateLink API",
     description="Real Estate Tenancy Management System",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Database configuration - loads from .env file with proper quote stripping
-DB_CONFIG = {
-    "dbname": os.getenv("DB_NAME", "estate_db"),
-    "user": os.getenv("DB_USER", "postgres"),
-    "password": os.getenv("DB_PASSWORD", "postgres").strip('"'),
-    "host": os.getenv("DB_HOST", "localhost").strip('"'),
-    "port": int(os.getenv("DB_PORT", "5432"))
+# Redis cache TTLs (seconds) for read-heavy endpoints
+CACHE_TTL = {
+    "statistics": 10,
+    "alerts": 30,
+    "contracts": 60
 }
 
+# Browser/proxy caching matches the Redis TTLs
+add_http_caching(app, {
+    "/api/v1/statistics": CACHE_TTL["statistics"],
+    "/api/v1/alerts/expiring": CACHE_TTL["alerts"]
+})
+
 
 # Pydantic models for request/response validation
 class TenantCreate(BaseModel):
@@ -92,18 +103,16 @@ class CheckResponse(BaseModel):
 @contextmanager
 def get_db_connection():
     """
-    Context manager for database connections.
-    Ensures connections are properly closed after use.
+    Context manager for pooled database connections.
+    Connections are returned to the shared pool after use.
     """
-    conn = None
     try:
-        conn = psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
-        yield conn
+        with pooled_connection(cursor_factory=RealDictCursor) as conn:
+            yield conn
+    except PoolError:
+        raise HTTPException(status_code=503, detail="Database busy, please retry")
     except psycopg2.Error as e:
         raise HTTPException(status_code=500, detail=f"Database connection error: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
 
 
 def get_db():
@@ -140,18 +149,37 @@ def health_check():
 
 # Contract endpoints
 @app.get("/api/v1/contracts", response_model=List[Dict[str, Any]])
-def get_contracts():
+def get_contracts(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
     """
-    Retrieve all contracts with tenant information.
+    Retrieve a page of contracts with tenant information, newest first.
+
+    Args:
+        limit: Page size (default: 50, max: 500)
+        offset: Number of contracts to skip (default: 0)
     """
-    try:
+    def load():
         with get_db_connection() as conn:
-            contracts = fetch_contracts(conn)
-            return contracts
+            return fetch_contracts(conn, limit=limit, offset=offset)
+
+    try:
+        return cached(f"contracts:v1:{limit}:{offset}", CACHE_TTL["contracts"], load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/v1/contracts/stream")
+def stream_contracts():
+    """
+    Stream all contracts as newline-delimited JSON, newest first.
+    """
+    def rows():
+        with get_db_connection() as conn:
+            for row in iter_contracts(conn):
+                yield orjson.dumps(row, default=json_default) + b"\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
 @app.get("/api/v1/contracts/{contract_id}")
 def get_contract(contract_id: int):
     """
@@ -286,7 +314,7 @@ def get_expiring_contracts(days: int = 100):
     if days < 1 or days > 365:
         raise HTTPException(status_code=400, detail="Days must be between 1 and 365")
 
-    try:
+    def load():
         with get_db_connection() as conn:
             alerts = get_alerts(conn, alert_days=days)
             return {
@@ -294,6 +322,9 @@ def get_expiring_contracts(days: int = 100):
                 "alert_threshold_days": days,
                 "expiring_contracts": alerts
             }
+
+    try:
+        return cached(f"alerts:{days}", CACHE_TTL["alerts"], load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -336,14 +367,21 @@ def create_tenant(tenant: TenantCreate):
 
 
 @app.get("/api/v1/tenants")
-def get_tenants():
+def get_tenants(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
     """
-    Retrieve all tenants.
+    Retrieve a page of tenants ordered by name.
+
+    Args:
+        limit: Page size (default: 50, max: 500)
+        offset: Number of tenants to skip (default: 0)
     """
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, name, email, phone FROM tenants ORDER BY name")
+            cursor.execute(
+                "SELECT id, name, email, phone FROM tenants ORDER BY name, id LIMIT %s OFFSET %s",
+                (limit, offset)
+            )
             tenants = cursor.fetchall()
             cursor.close()
             return {"count": len(tenants), "tenants": tenants}
@@ -400,54 +438,33 @@ def get_statistics():
     """
     Get overall system statistics.
     """
-    try:
+    def load():
         with get_db_connection() as conn:
             cursor = conn.cursor()
 
-            stats = {}
-
-            # Total tenants
-            cursor.execute("SELECT COUNT(*) FROM tenants")
-            stats['total_tenants'] = cursor.fetchone()[0]
-
-            # Total contracts
-            cursor.execute("SELECT COUNT(*) FROM contracts")
-            stats['total_contracts'] = cursor.fetchone()[0]
-
-            # Active contracts (not expired)
-            cursor.execute("SELECT COUNT(*) FROM contracts WHERE expiry_date >= CURRENT_DATE")
-            stats['active_contracts'] = cursor.fetchone()[0]
-
-            # Expired contracts
-            cursor.execute("SELECT COUNT(*) FROM contracts WHERE expiry_date < CURRENT_DATE")
-            stats['expired_contracts'] = cursor.fetchone()[0]
-
-            # Total checks
-            cursor.execute("SELECT COUNT(*) FROM checks")
-            stats['total_checks'] = cursor.fetchone()[0]
-
-            # Overdue checks
-            cursor.execute("SELECT COUNT(*) FROM checks WHERE check_date < CURRENT_DATE")
-            stats['overdue_checks'] = cursor.fetchone()[0]
-
-            # Upcoming checks (next 30 days)
-            cursor.execute("""
-                SELECT COUNT(*) FROM checks
-                WHERE check_date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '30 days'
-            """)
-            stats['upcoming_checks_30days'] = cursor.fetchone()[0]
-
-            # Expiring contracts (next 100 days)
+            # All counts in a single round-trip
             cursor.execute("""
-                SELECT COUNT(*) FROM contracts
-                WHERE expiry_date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '100 days'
+                SELECT
+                    (SELECT COUNT(*) FROM tenants) AS total_tenants,
+                    COUNT(*) AS total_contracts,
+                    COUNT(*) FILTER (WHERE expiry_date >= CURRENT_DATE) AS active_contracts,
+                    COUNT(*) FILTER (WHERE expiry_date < CURRENT_DATE) AS expired_contracts,
+                    (SELECT COUNT(*) FROM checks) AS total_checks,
+                    (SELECT COUNT(*) FROM checks WHERE check_date < CURRENT_DATE) AS overdue_checks,
+                    (SELECT COUNT(*) FROM checks
+                     WHERE check_date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '30 days') AS upcoming_checks_30days,
+                    COUNT(*) FILTER (
+                        WHERE expiry_date BETWEEN CURRENT_DATE AND CURRENT_DATE + INTERVAL '100 days'
+                    ) AS expiring_contracts_100days
+                FROM contracts
             """)
-            stats['expiring_contracts_100days'] = cursor.fetchone()[0]
-
+            stats = dict(cursor.fetchone())
             cursor.close()
 
             return stats
 
+    try:
+        return cached("stats:v1", CACHE_TTL["statistics"], load)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -458,5 +475,7 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        workers=int(os.getenv("WEB_CONCURRENCY", "4")),
+        loop="uvloop",
+        http="httptools"
     )
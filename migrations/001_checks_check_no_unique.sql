@@ -0,0 +1,4 @@
+-- Check numbers identify a contract's instalment (CHK<contract><n>) and must be unique.
+-- Required by the ON CONFLICT (check_no) clause in generate_checks.
+-- CONCURRENTLY keeps the table writable during the build; run outside a transaction.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS checks_check_no_uq ON checks (check_no);
@@ -0,0 +1,8 @@
+-- Range and join indexes for the hot WHERE clauses.
+-- checks.check_date:      get_overdue_checks (< CURRENT_DATE), get_upcoming_checks (BETWEEN)
+-- checks.contract_id:     get_contract_summary, per-contract counts in generate_checks
+-- contracts.expiry_date:  get_alerts (BETWEEN), active/expired statistics
+-- CONCURRENTLY keeps the table writable during the build; run outside a transaction.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS checks_check_date_idx ON checks (check_date);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS checks_contract_id_idx ON checks (contract_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS contracts_expiry_idx ON contracts (expiry_date);
@@ -6,20 +6,24 @@ Modules:
     - database: Supabase connection and cursor implementation
     - contracts: Contract-related operations
     - checks: Payment check operations
+    - statistics: Aggregate counts for dashboards
     - utils: Utility functions
     - config: Configuration settings
 """
 
 from .database import SupabaseConnection
-from .contracts import fetch_contracts, get_alerts, get_contract_summary
+from .contracts import fetch_contracts, iter_contracts, get_alerts, get_contract_summary
 from .checks import generate_checks, get_overdue_checks, get_upcoming_checks
+from .statistics import get_dashboard_counts
 
 __all__ = [
     'SupabaseConnection',
     'fetch_contracts',
+    'iter_contracts',
     'get_alerts',
     'get_contract_summary',
     'generate_checks',
     'get_overdue_checks',
     'get_upcoming_checks',
+    'get_dashboard_counts',
 ]
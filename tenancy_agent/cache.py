@@ -0,0 +1,71 @@
+"""Short-TTL Redis cache for read-heavy endpoints"""
+import logging
+from decimal import Decimal
+from typing import Any, Callable, Optional
+import orjson
+import redis
+from .config import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+# How long the last good result is kept as a fallback for database failures
+STALE_TTL = 24 * 60 * 60
+
+_client = redis.Redis.from_url(REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5) if REDIS_URL else None
+
+
+def json_default(value: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+def _get(key: str) -> Optional[bytes]:
+    """GET a key, treating Redis errors as a cache miss"""
+    try:
+        return _client.get(key)
+    except redis.RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {str(e)}")
+        return None
+
+
+def cached(key: str, ttl: int, loader: Callable[[], Any]) -> Any:
+    """Return the cached value for key, or compute and cache it
+
+    Args:
+        key: Cache key, e.g. 'stats:v1'
+        ttl: Seconds the fresh value stays cached
+        loader: Zero-argument callable producing the value from the database
+
+    Returns:
+        JSON-compatible value, either from Redis or freshly loaded
+
+    Raises:
+        Exception: If loader fails and no stale copy is cached
+    """
+    if _client is None:
+        return loader()
+
+    hit = _get(key)
+    if hit is not None:
+        return orjson.loads(hit)
+
+    try:
+        result = loader()
+    except Exception:
+        stale = _get(f"stale:{key}")
+        if stale is None:
+            raise
+        logger.warning(f"Serving stale cache for {key} after load failure")
+        return orjson.loads(stale)
+
+    payload = orjson.dumps(result, default=json_default)
+    try:
+        pipe = _client.pipeline()
+        pipe.setex(key, ttl, payload)
+        pipe.setex(f"stale:{key}", STALE_TTL, payload)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {str(e)}")
+    return result
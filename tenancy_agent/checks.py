@@ -1,71 +1,132 @@
 """Check-related functions"""
-from datetime import datetime, timedelta
-from decimal import Decimal
 from typing import List, Dict, Any
 import logging
-from .utils import rows_to_dicts
+from psycopg2.extras import RealDictCursor
 
 logger = logging.getLogger(__name__)
 
-
-def generate_checks(conn) -> Dict[str, Any]:
+# Rows pulled per round trip by the server-side cursors of the check listings,
+# which grow with every contract ever signed
+CHECKS_ITERSIZE = 1000
+
+# Contracts handled per generate_checks transaction; each window commits on its own
+GENERATE_BATCH_CONTRACTS = 1000
+
+# Builds every missing check for the next window of contracts (ordered by id, after
+# %(after_id)s) that have fewer than num_checks, in one statement.
+# Check i of n falls on start_date + span_days * i / n and numbers follow CHK{contract:03d}{i+1:02d}.
+# Existing checks are counted once per contract up front rather than probed per contract.
+# Counts in the outer SELECT see the table as it was before the insert; a contract's
+# num_checks checks are each counted once, as either generated or skipped.
+_SQL_GENERATE_CHECKS = """
+    WITH batch AS (
+        SELECT id, start_date, expiry_date, annual_rent, num_checks
+        FROM contracts
+        WHERE id > %(after_id)s
+        ORDER BY id
+        LIMIT %(batch_size)s
+    ),
+    existing AS (
+        SELECT ch.contract_id, COUNT(*) AS n
+        FROM checks ch
+        INNER JOIN batch b ON b.id = ch.contract_id
+        GROUP BY ch.contract_id
+    ),
+    candidates AS (
+        SELECT c.id AS contract_id,
+               'CHK' || lpad(c.id::text, GREATEST(3, length(c.id::text)), '0')
+                     || lpad((gs + 1)::text, 2, '0') AS check_no,
+               c.start_date + (c.expiry_date - c.start_date) * gs / c.num_checks AS check_date,
+               round(c.annual_rent::numeric / c.num_checks, 2) AS amount
+        FROM batch c
+        LEFT JOIN existing e ON e.contract_id = c.id
+        CROSS JOIN LATERAL generate_series(0, c.num_checks - 1) AS gs
+        WHERE COALESCE(e.n, 0) < c.num_checks
+    ),
+    inserted AS (
+        INSERT INTO checks (contract_id, check_no, check_date, amount)
+        SELECT contract_id, check_no, check_date, amount FROM candidates
+        ON CONFLICT (check_no) DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT COUNT(*) FROM batch) AS total_contracts,
+           (SELECT MAX(id) FROM batch) AS last_contract_id,
+           (SELECT COUNT(*) FROM inserted) AS checks_generated,
+           (SELECT COUNT(*) FROM candidates) - (SELECT COUNT(*) FROM inserted)
+           + (SELECT COALESCE(SUM(c.num_checks), 0)::bigint FROM existing e
+              INNER JOIN batch c ON c.id = e.contract_id
+              WHERE e.n >= c.num_checks) AS checks_skipped
+"""
+
+
+# Checks dated before today, oldest first
+_SQL_OVERDUE_CHECKS = """
+    SELECT ch.id as check_id, ch.check_no, ch.check_date, ch.amount,
+           c.id as contract_id, c.property_name, c.location,
+           t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone,
+           c.agent_name, c.agent_email, (CURRENT_DATE - ch.check_date) as days_overdue
+    FROM checks ch
+    INNER JOIN contracts c ON ch.contract_id = c.id
+    INNER JOIN tenants t ON c.tenant_id = t.id
+    WHERE ch.check_date < CURRENT_DATE
+    ORDER BY ch.check_date ASC
+"""
+
+# Checks due within %s days, soonest first
+_SQL_UPCOMING_CHECKS = """
+    SELECT ch.id as check_id, ch.check_no, ch.check_date, ch.amount,
+           c.id as contract_id, c.property_name, c.location,
+           t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone,
+           c.agent_name, c.agent_email, (ch.check_date - CURRENT_DATE) as days_until_due
+    FROM checks ch
+    INNER JOIN contracts c ON ch.contract_id = c.id
+    INNER JOIN tenants t ON c.tenant_id = t.id
+    WHERE ch.check_date BETWEEN CURRENT_DATE AND CURRENT_DATE + %s
+    ORDER BY ch.check_date ASC
+"""
+
+
+def generate_checks(conn, batch_size: int = GENERATE_BATCH_CONTRACTS) -> Dict[str, Any]:
     """Generate payment checks for all contracts
 
+    Contracts are processed in id order, batch_size at a time, with a commit
+    after each window. A failure rolls back only the window in progress;
+    windows committed before it are kept and a rerun picks up from there.
+
     Args:
         conn: Database connection object
+        batch_size: Contracts per transaction (default: GENERATE_BATCH_CONTRACTS)
 
     Returns:
         Dictionary with generation statistics:
             - total_contracts: Number of contracts processed
             - checks_generated: Number of checks created
-            - checks_skipped: Number of checks already existing
+            - checks_skipped: Number of expected checks that already existed
 
     Raises:
         Exception: If database operations fail
     """
+    stats = {'total_contracts': 0, 'checks_generated': 0, 'checks_skipped': 0}
+    after_id = 0
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, start_date, expiry_date, annual_rent, num_checks FROM contracts ORDER BY id")
-        contracts = cursor.fetchall()
-
-        stats = {"total_contracts": len(contracts), "checks_generated": 0, "checks_skipped": 0}
-
-        for cid, start, end, rent, num in contracts:
-            # Check existing
-            cursor.execute("SELECT COUNT(*) FROM checks WHERE contract_id = %s", (cid,))
-            existing = cursor.fetchone()[0]
-
-            if existing >= num:
-                stats["checks_skipped"] += existing
-                logger.debug(f"Contract {cid} already has {existing} checks, skipping")
-                continue
-
-            # Calculate and insert
-            amount = round(Decimal(str(rent)) / Decimal(str(num)), 2)
-            interval = (end - start).days / num
-
-            for i in range(num):
-                check_no = f"CHK{cid:03d}{i+1:02d}"
-                cursor.execute("SELECT id FROM checks WHERE check_no = %s", (check_no,))
-
-                if cursor.fetchone():
-                    stats["checks_skipped"] += 1
-                    continue
-
-                check_date = start + timedelta(days=int(interval * i))
-                cursor.execute(
-                    "INSERT INTO checks (contract_id, check_no, check_date, amount) VALUES (%s, %s, %s, %s)",
-                    (cid, check_no, check_date, amount)
-                )
-                stats["checks_generated"] += 1
-
-        conn.commit()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        while True:
+            cursor.execute(_SQL_GENERATE_CHECKS, {'after_id': after_id, 'batch_size': batch_size})
+            window = cursor.fetchone()
+            conn.commit()
+
+            for key in stats:
+                stats[key] += window[key]
+            if window['total_contracts'] < batch_size:
+                break
+            after_id = window['last_contract_id']
+
         cursor.close()
         logger.info(f"Check generation complete: {stats}")
         return stats
     except Exception as e:
         conn.rollback()
-        logger.error(f"Error generating checks: {str(e)}")
+        logger.error(f"Error generating checks after contract {after_id}: {str(e)}")
         raise
 
 
@@ -82,22 +143,12 @@ def get_overdue_checks(conn) -> List[Dict[str, Any]]:
         Exception: If database query fails
     """
     try:
-        cursor = conn.cursor()
-        today = datetime.now().date()
-
-        cursor.execute("""
-            SELECT ch.id as check_id, ch.check_no, ch.check_date, ch.amount,
-                   c.id as contract_id, c.property_name, c.location,
-                   t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone,
-                   c.agent_name, c.agent_email, (%s - ch.check_date) as days_overdue
-            FROM checks ch
-            INNER JOIN contracts c ON ch.contract_id = c.id
-            INNER JOIN tenants t ON c.tenant_id = t.id
-            WHERE ch.check_date < %s
-            ORDER BY ch.check_date ASC
-        """, (today, today))
-
-        checks = rows_to_dicts([d[0] for d in cursor.description], cursor.fetchall(), ['days_overdue'])
+        cursor = conn.cursor(name=f"overdue_{id(conn)}", cursor_factory=RealDictCursor)
+        cursor.itersize = CHECKS_ITERSIZE
+
+        cursor.execute(_SQL_OVERDUE_CHECKS)
+
+        checks = list(cursor)
         cursor.close()
         logger.info(f"Found {len(checks)} overdue checks")
         return checks
@@ -120,23 +171,12 @@ def get_upcoming_checks(conn, days_ahead: int = 30) -> List[Dict[str, Any]]:
         Exception: If database query fails
     """
     try:
-        cursor = conn.cursor()
-        today = datetime.now().date()
-        future = today + timedelta(days=days_ahead)
-
-        cursor.execute("""
-            SELECT ch.id as check_id, ch.check_no, ch.check_date, ch.amount,
-                   c.id as contract_id, c.property_name, c.location,
-                   t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone,
-                   c.agent_name, c.agent_email, (ch.check_date - %s) as days_until_due
-            FROM checks ch
-            INNER JOIN contracts c ON ch.contract_id = c.id
-            INNER JOIN tenants t ON c.tenant_id = t.id
-            WHERE ch.check_date BETWEEN %s AND %s
-            ORDER BY ch.check_date ASC
-        """, (today, today, future))
-
-        checks = rows_to_dicts([d[0] for d in cursor.description], cursor.fetchall(), ['days_until_due'])
+        cursor = conn.cursor(name=f"upcoming_{id(conn)}", cursor_factory=RealDictCursor)
+        cursor.itersize = CHECKS_ITERSIZE
+
+        cursor.execute(_SQL_UPCOMING_CHECKS, (days_ahead,))
+
+        checks = list(cursor)
         cursor.close()
         logger.info(f"Found {len(checks)} checks due within {days_ahead} days")
         return checks
@@ -1,17 +1,96 @@
 """Contract-related functions"""
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import logging
-from .utils import rows_to_dicts
+from psycopg2.extras import RealDictCursor
 
 logger = logging.getLogger(__name__)
 
+# Rows pulled per round trip when streaming from a server-side cursor
+STREAM_ITERSIZE = 2000
+
+# Columns fetch_contracts/iter_contracts can return, mapped to their SQL expression
+CONTRACT_FIELDS = MappingProxyType({
+    'contract_id': 'c.id',
+    'tenant_id': 'c.tenant_id',
+    'property_name': 'c.property_name',
+    'location': 'c.location',
+    'start_date': 'c.start_date',
+    'expiry_date': 'c.expiry_date',
+    'annual_rent': 'c.annual_rent',
+    'num_checks': 'c.num_checks',
+    'payment_method': 'c.payment_method',
+    'agent_name': 'c.agent_name',
+    'agent_email': 'c.agent_email',
+    'tenant_name': 't.name',
+    'tenant_email': 't.email',
+    'tenant_phone': 't.phone',
+})
+
+
+# Contracts expiring within %s days, soonest first
+_SQL_ALERTS = """
+    SELECT c.id as contract_id, c.property_name, c.location, c.start_date, c.expiry_date,
+           c.annual_rent, c.num_checks, c.payment_method, c.agent_name, c.agent_email,
+           t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone,
+           (c.expiry_date - CURRENT_DATE) as days_until_expiry
+    FROM contracts c
+    INNER JOIN tenants t ON c.tenant_id = t.id
+    WHERE c.expiry_date BETWEEN CURRENT_DATE AND CURRENT_DATE + %s
+    ORDER BY c.expiry_date ASC
+"""
+
+# One contract with tenant details and its checks aggregated in date order
+_SQL_CONTRACT_SUMMARY = """
+    SELECT c.id as contract_id, c.tenant_id, c.property_name, c.location,
+           c.start_date, c.expiry_date, c.annual_rent, c.num_checks,
+           c.payment_method, c.agent_name, c.agent_email,
+           t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone,
+           COALESCE(
+               json_agg(json_build_object(
+                   'id', ch.id, 'check_no', ch.check_no,
+                   'check_date', ch.check_date, 'amount', ch.amount
+               ) ORDER BY ch.check_date) FILTER (WHERE ch.id IS NOT NULL),
+               '[]'
+           ) as checks
+    FROM contracts c
+    INNER JOIN tenants t ON c.tenant_id = t.id
+    LEFT JOIN checks ch ON ch.contract_id = c.id
+    WHERE c.id = %s
+    GROUP BY c.id, t.id
+"""
+
+
+@lru_cache(maxsize=32)
+def _fetch_contracts_sql(fields: Tuple[str, ...]) -> str:
+    """Contracts listing statement returning only the given columns
 
-def fetch_contracts(conn) -> List[Dict[str, Any]]:
-    """Fetch all contracts with tenant information
+    Raises:
+        ValueError: If a field is not in CONTRACT_FIELDS
+    """
+    unknown = [f for f in fields if f not in CONTRACT_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown contract fields: {', '.join(unknown) or '(none given)'}")
+    columns = ", ".join(f"{CONTRACT_FIELDS[f]} as {f}" for f in fields)
+    return f"""
+    SELECT {columns}
+    FROM contracts c
+    INNER JOIN tenants t ON c.tenant_id = t.id
+    ORDER BY c.start_date DESC, c.id DESC
+    LIMIT %s OFFSET %s
+"""
+
+
+def fetch_contracts(conn, limit: Optional[int] = None, offset: int = 0,
+                    fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Fetch contracts with tenant information, newest first
 
     Args:
         conn: Database connection object
+        limit: Maximum number of contracts to return (default: all)
+        offset: Number of contracts to skip (default: 0)
+        fields: Columns to return, from CONTRACT_FIELDS (default: all)
 
     Returns:
         List of dictionaries containing contract and tenant details
@@ -20,19 +99,15 @@ def fetch_contracts(conn) -> List[Dict[str, Any]]:
         Exception: If database query fails
     """
     try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT c.id as contract_id, c.tenant_id, c.property_name, c.location,
-                   c.start_date, c.expiry_date, c.annual_rent, c.num_checks,
-                   c.payment_method, c.agent_name, c.agent_email,
-                   t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone
-            FROM contracts c
-            INNER JOIN tenants t ON c.tenant_id = t.id
-            ORDER BY c.start_date DESC
-        """)
-
-        contracts = rows_to_dicts([d[0] for d in cursor.description], cursor.fetchall())
-        cursor.close()
+        if limit is None:
+            # Unbounded listing: stream from a server-side cursor instead of
+            # buffering the whole result client-side before building dicts
+            contracts = list(iter_contracts(conn, offset=offset, fields=fields))
+        else:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(_fetch_contracts_sql(tuple(fields or CONTRACT_FIELDS)), (limit, offset))
+            contracts = cursor.fetchall()
+            cursor.close()
         logger.info(f"Fetched {len(contracts)} contracts from database")
         return contracts
     except Exception as e:
@@ -40,6 +115,35 @@ def fetch_contracts(conn) -> List[Dict[str, Any]]:
         raise
 
 
+def iter_contracts(conn, itersize: int = STREAM_ITERSIZE, offset: int = 0,
+                   fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Stream every contract with tenant information, newest first
+
+    Uses a server-side cursor so memory stays bounded by itersize rather
+    than the size of the contracts table.
+
+    Args:
+        conn: Database connection object
+        itersize: Rows fetched from the server per round trip (default: 2000)
+        offset: Number of contracts to skip (default: 0)
+        fields: Columns to return, from CONTRACT_FIELDS (default: all)
+
+    Yields:
+        Dictionaries containing contract and tenant details
+
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        with conn.cursor(name=f"fc_{id(conn)}", cursor_factory=RealDictCursor) as cursor:
+            cursor.itersize = itersize
+            cursor.execute(_fetch_contracts_sql(tuple(fields or CONTRACT_FIELDS)), (None, offset))
+            yield from cursor
+    except Exception as e:
+        logger.error(f"Error streaming contracts: {str(e)}")
+        raise
+
+
 def get_alerts(conn, alert_days: int = 100) -> List[Dict[str, Any]]:
     """Get contracts expiring within specified days
 
@@ -54,22 +158,11 @@ def get_alerts(conn, alert_days: int = 100) -> List[Dict[str, Any]]:
         Exception: If database query fails
     """
     try:
-        cursor = conn.cursor()
-        today = datetime.now().date()
-        threshold = today + timedelta(days=alert_days)
-
-        cursor.execute("""
-            SELECT c.id as contract_id, c.property_name, c.location, c.start_date, c.expiry_date,
-                   c.annual_rent, c.num_checks, c.payment_method, c.agent_name, c.agent_email,
-                   t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone,
-                   (c.expiry_date - %s) as days_until_expiry
-            FROM contracts c
-            INNER JOIN tenants t ON c.tenant_id = t.id
-            WHERE c.expiry_date BETWEEN %s AND %s
-            ORDER BY c.expiry_date ASC
-        """, (today, today, threshold))
-
-        alerts = rows_to_dicts([d[0] for d in cursor.description], cursor.fetchall(), ['days_until_expiry'])
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+        cursor.execute(_SQL_ALERTS, (alert_days,))
+
+        alerts = cursor.fetchall()
         cursor.close()
         logger.info(f"Found {len(alerts)} contracts expiring within {alert_days} days")
         return alerts
@@ -93,35 +186,19 @@ def get_contract_summary(conn, contract_id: int) -> Optional[Dict[str, Any]]:
         Exception: If database query fails
     """
     try:
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT c.id as contract_id, c.tenant_id, c.property_name, c.location,
-                   c.start_date, c.expiry_date, c.annual_rent, c.num_checks,
-                   c.payment_method, c.agent_name, c.agent_email,
-                   t.name as tenant_name, t.email as tenant_email, t.phone as tenant_phone
-            FROM contracts c
-            INNER JOIN tenants t ON c.tenant_id = t.id
-            WHERE c.id = %s
-        """, (contract_id,))
-
-        row = cursor.fetchone()
-        if not row:
-            cursor.close()
-            return None
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-        contract = dict(zip([d[0] for d in cursor.description], row))
+        # Contract, tenant and all checks in one round-trip
+        cursor.execute(_SQL_CONTRACT_SUMMARY, (contract_id,))
 
-        cursor.execute("""
-            SELECT id, check_no, check_date, amount
-            FROM checks WHERE contract_id = %s ORDER BY check_date ASC
-        """, (contract_id,))
+        contract = cursor.fetchone()
+        cursor.close()
+        if not contract:
+            return None
 
-        checks = rows_to_dicts([d[0] for d in cursor.description], cursor.fetchall())
-        contract['checks'] = checks
+        checks = contract['checks']
         contract['total_checks_count'] = len(checks)
 
-        cursor.close()
         logger.info(f"Retrieved contract {contract_id} with {len(checks)} checks")
         return contract
     except Exception as e:
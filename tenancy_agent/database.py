@@ -1,20 +1,223 @@
 """Database connection and cursor implementation using Supabase REST API"""
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from functools import lru_cache
+from decimal import Decimal, ROUND_HALF_UP
+import asyncio
+import atexit
 import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 import httpx
-from .config import SUPABASE_URL, SUPABASE_HEADERS
+import orjson
+from .config import SUPABASE_URL, SUPABASE_HEADERS, SUPABASE_CACHE_TTL
+from .utils import rows_to_dicts
 
 logger = logging.getLogger(__name__)
 
+TWOPLACES = Decimal("0.01")
+
+# Contract columns in SupabaseCursor.CONTRACT_COLS order, tenant embedded
+CONTRACT_SELECT = (
+    "id,tenant_id,property_name,location,start_date,expiry_date,annual_rent,num_checks,"
+    "payment_method,agent_name,agent_email,tenants(name,email,phone)"
+)
+_CONTRACT_GETTER = itemgetter(
+    'id', 'tenant_id', 'property_name', 'location', 'start_date', 'expiry_date', 'annual_rent',
+    'num_checks', 'payment_method', 'agent_name', 'agent_email'
+)
+_TENANT_GETTER = itemgetter('name', 'email', 'phone')
+_NO_TENANT = (None, None, None)
+
+# Contracts with tenant and checks embedded, checks in date order, for the summary query
+CONTRACTS_WITH_CHECKS = (
+    f"contracts?select={CONTRACT_SELECT},checks(id,check_no,check_date,amount)"
+    "&checks.order=check_date.asc"
+)
+
+# Shared keep-alive client so queries skip the TCP/TLS handshake after the first.
+# Bodies are encoded/decoded with orjson; SUPABASE_HEADERS sets the JSON content type.
+_HTTP = httpx.Client(
+    base_url=SUPABASE_URL,
+    headers=SUPABASE_HEADERS,
+    http2=True,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+)
+atexit.register(_HTTP.close)
+
+# endpoint -> (monotonic time fetched, JSON rows); repeat reads within
+# SUPABASE_CACHE_TTL skip the HTTP call
+_CACHE = {}
+
+# endpoint -> (monotonic time fetched, row count) for the HEAD count requests;
+# kept apart from _CACHE so the two value types never mix
+_COUNT_CACHE = {}
+
+# Entries kept per cache; keys carry dates and offsets, so without a bound a
+# long-running process accumulates them forever
+_CACHE_MAX = 256
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(cache, key):
+    """Cached value for key if it is younger than SUPABASE_CACHE_TTL, else None"""
+    hit = cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < SUPABASE_CACHE_TTL:
+        return hit[1]
+    return None
+
+
+def _cache_put(cache, key, value):
+    """Store value under key, evicting expired then oldest entries when full"""
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        cache.pop(key, None)
+        if len(cache) >= _CACHE_MAX:
+            for stale in [k for k, (fetched, _) in cache.items() if now - fetched >= SUPABASE_CACHE_TTL]:
+                del cache[stale]
+            while len(cache) >= _CACHE_MAX:
+                del cache[next(iter(cache))]
+        cache[key] = (now, value)
+
+# HEAD request headers asking PostgREST for just the row count
+_COUNT_HEADERS = {"Prefer": "count=exact", "Range-Unit": "items", "Range": "0-0"}
+
+
+# Fixed parts of the alert endpoints; only the dates vary per call
+_EP_EXPIRY = f"contracts?select={CONTRACT_SELECT}&expiry_date=gte."
+_EP_EXPIRY_MID = "&expiry_date=lte."
+_EP_EXPIRY_ORDER = "&order=expiry_date.asc"
+_EP_CHECKS = (
+    "checks?select=id,contract_id,check_no,check_date,amount,"
+    "contracts(property_name,location,agent_name,agent_email,tenants(name,email,phone))"
+)
+_EP_OVERDUE = _EP_CHECKS + "&check_date=lt."
+_EP_UPCOMING = _EP_CHECKS + "&check_date=gte."
+_EP_UPCOMING_MID = "&check_date=lte."
+_EP_CHECKS_ORDER = "&order=check_date.asc"
+
+
+def _expiring_endpoint(today, days):
+    return "".join((_EP_EXPIRY, str(today), _EP_EXPIRY_MID, str(today + timedelta(days=days)), _EP_EXPIRY_ORDER))
+
+
+def _overdue_endpoint(today, days=None):
+    return "".join((_EP_OVERDUE, str(today), _EP_CHECKS_ORDER))
+
+
+def _upcoming_endpoint(today, days):
+    return "".join((_EP_UPCOMING, str(today), _EP_UPCOMING_MID, str(today + timedelta(days=days)), _EP_CHECKS_ORDER))
+
+
+# Alert type -> endpoint builder taking (today, look-ahead days)
+_ALERT_ENDPOINTS = {
+    "expiring": _expiring_endpoint,
+    "overdue": _overdue_endpoint,
+    "upcoming": _upcoming_endpoint,
+}
+
+
+def alert_endpoints(today, alert_days=100, days_ahead=30):
+    """PostgREST endpoints behind the expiry, overdue and upcoming queries
+
+    Returns:
+        Dictionary keyed by (alert type, look-ahead days)
+    """
+    return {
+        ("expiring", alert_days): _expiring_endpoint(today, alert_days),
+        ("overdue", None): _overdue_endpoint(today),
+        ("upcoming", days_ahead): _upcoming_endpoint(today, days_ahead),
+    }
+
+
+async def fetch_all_alerts(today, alert_days=100, days_ahead=30):
+    """Fetch the three alert endpoints concurrently
+
+    Args:
+        today: Reference date for the date filters
+        alert_days: Look-ahead for expiring contracts (default: 100)
+        days_ahead: Look-ahead for upcoming checks (default: 30)
+
+    Returns:
+        Dictionary mapping (alert type, look-ahead days) to the JSON rows
+    """
+    endpoints = alert_endpoints(today, alert_days, days_ahead)
+    async with httpx.AsyncClient(base_url=SUPABASE_URL, headers=SUPABASE_HEADERS, http2=True) as client:
+        responses = await asyncio.gather(*(client.get(e) for e in endpoints.values()))
+    return {key: orjson.loads(r.content) if r.status_code == 200 else [] for key, r in zip(endpoints, responses)}
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(val):
+    """Parse an ISO date string; the same dates repeat across contracts and checks"""
+    return date.fromisoformat(val[:10])
+
+
+@lru_cache(maxsize=64)
+def _select_aliases(query):
+    """Output column names of a SELECT whose columns are all aliased with 'as'"""
+    select_list = query.lower().split(" from ", 1)[0]
+    return tuple(re.findall(r"\bas (\w+)", select_list))
+
+
+@lru_cache(maxsize=64)
+def _classify(query):
+    """Map a SQL string to the SupabaseCursor handler key for its query shape
+
+    The application issues a small fixed set of statements, so each distinct
+    string is only scanned once.
+    """
+    q = query.lower().strip()
+
+    if "generate_series" in q:
+        return "generate_checks"
+    if "count(*)" in q:
+        return "dashboard_counts" if "as overdue_payments" in q else "unsupported"
+    if q.startswith("insert"):
+        return "insert_check" if "into checks" in q else "unsupported"
+    if not q.startswith("select"):
+        return "unsupported"
+
+    if "where c.expiry_date between" in q:
+        return "select_expiring"
+    if "json_agg" in q:
+        return "select_summary"
+    if "from contracts" in q and "join tenants" in q:
+        return "select_contracts"
+    if "from checks" in q and "where contract_id" in q:
+        return "select_contract_checks"
+    if "from checks ch" in q and "join contracts" in q:
+        if "where ch.check_date <" in q:
+            return "select_overdue"
+        if "where ch.check_date between" in q:
+            return "select_upcoming"
+        return "unsupported"
+    return "select_generic"
+
 
 class SupabaseConnection:
     """Mock connection object that uses Supabase REST API"""
     def __init__(self):
-        self.url = SUPABASE_URL
-        self.headers = SUPABASE_HEADERS
+        # (alert type, look-ahead days) -> rows, consumed by the next matching query
+        self.prefetched_alerts = {}
+
+    def cursor(self, name=None, cursor_factory=None):
+        # name (server-side cursor) has no REST equivalent and is ignored.
+        # Any cursor_factory (e.g. RealDictCursor) switches the cursor to dict rows
+        return SupabaseCursor(self, as_dict=cursor_factory is not None)
+
+    def prefetch_alerts(self, alert_days=100, days_ahead=30):
+        """Fetch expiring contracts, overdue and upcoming checks in parallel
 
-    def cursor(self):
-        return SupabaseCursor(self.url, self.headers)
+        The following get_alerts/get_overdue_checks/get_upcoming_checks calls
+        with the same look-ahead are served from these results, so the three
+        round trips overlap instead of running back to back. Must not be
+        called from inside a running event loop.
+        """
+        today = date.today()
+        self.prefetched_alerts = asyncio.run(fetch_all_alerts(today, alert_days, days_ahead))
 
     def commit(self):
         pass
@@ -36,32 +239,74 @@ class SupabaseCursor:
         ('tenant_name',), ('tenant_email',), ('tenant_phone',)
     ]
 
-    def __init__(self, url, headers):
-        self.url = url
-        self.headers = headers
+    CHECK_COLS = [
+        ('check_id',), ('check_no',), ('check_date',), ('amount',), ('contract_id',),
+        ('property_name',), ('location',), ('tenant_name',), ('tenant_email',),
+        ('tenant_phone',), ('agent_name',), ('agent_email',)
+    ]
+
+    def __init__(self, connection, as_dict=False):
+        self.connection = connection
+        self.as_dict = as_dict
         self.description = None
+        self._columns = None
         self._results = []
-        self._row_index = 0
+        self._iter = iter(())
+        self.itersize = 2000
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
 
     @staticmethod
     def _to_date(val):
         """Convert date string to date object if needed"""
-        return datetime.fromisoformat(val).date() if isinstance(val, str) else val
+        return _parse_date(val) if isinstance(val, str) else val
 
-    def _fetch(self, endpoint):
-        """GET request, return JSON or empty list"""
-        r = httpx.get(f"{self.url}/{endpoint}", headers=self.headers)
-        return r.json() if r.status_code == 200 else []
+    def _fetch(self, endpoint, cache=True):
+        """GET request, return JSON or empty list
+
+        Successful responses are reused for SUPABASE_CACHE_TTL seconds unless
+        cache is False.
+        """
+        if cache and SUPABASE_CACHE_TTL > 0:
+            rows = _cache_get(_CACHE, endpoint)
+            if rows is not None:
+                return rows
+
+        r = _HTTP.get(endpoint)
+        if r.status_code != 200:
+            return []
+        rows = orjson.loads(r.content)
+        if cache and SUPABASE_CACHE_TTL > 0:
+            _cache_put(_CACHE, endpoint, rows)
+        return rows
+
+    @staticmethod
+    def invalidate(prefix):
+        """Drop cached responses and counts for endpoints starting with prefix"""
+        with _CACHE_LOCK:
+            for cache in (_CACHE, _COUNT_CACHE):
+                for endpoint in [e for e in cache if e.startswith(prefix)]:
+                    del cache[endpoint]
+
+    def _invalidate_checks(self):
+        """Evict everything that includes checks after rows were inserted"""
+        self.invalidate("checks")
+        self.invalidate(CONTRACTS_WITH_CHECKS)
 
     def _build_contract_row(self, c):
         """Build contract row from API data"""
-        tenant = c.get('tenants', {})
+        row = _CONTRACT_GETTER(c)
+        tenant = c.get('tenants')
         return (
-            c['id'], c['tenant_id'], c['property_name'], c['location'],
-            self._to_date(c['start_date']), self._to_date(c['expiry_date']),
-            c['annual_rent'], c['num_checks'], c['payment_method'],
-            c['agent_name'], c['agent_email'],
-            tenant.get('name'), tenant.get('email'), tenant.get('phone')
+            *row[:4], self._to_date(row[4]), self._to_date(row[5]), *row[6:],
+            *(_TENANT_GETTER(tenant) if tenant else _NO_TENANT)
         )
 
     def _build_check_row(self, ch, today, upcoming=False):
@@ -79,117 +324,250 @@ class SupabaseCursor:
         )
 
     def execute(self, query, params=None):
-        """Execute SQL-like operations via REST API"""
-        self._row_index = 0
-        q = query.lower().strip()
-
-        if "count(*)" in q:
-            self._handle_count(query, params)
-        elif q.startswith("select"):
-            self._handle_select(query, params)
-        elif q.startswith("insert"):
-            self._handle_insert(query, params)
-        else:
+        """Execute SQL-like operations via REST API
+
+        Date filters written against CURRENT_DATE are evaluated with today's
+        local date; the only bound parameter is the look-ahead in days.
+        """
+        self.description = None
+        self._results = []
+        handler = _DISPATCH.get(_classify(query))
+        if handler is None:
             logger.warning(f"Unsupported query: {query[:50]}...")
+        else:
+            handler(self, query, params)
+        # Statements without a result set still answer fetchone() with (0,)
+        if self.description is not None:
+            # Column names resolved once per query, not once per dict row
+            self._columns = [d[0] for d in self.description]
+            self._iter = iter(self._results)
+        else:
+            self._columns = None
+            self._iter = iter([(0,)])
 
-    def _handle_select(self, query, params):
-        """Handle SELECT queries"""
-        q = query.lower()
-
-        # Contracts with tenants
-        if "from contracts" in q and "join tenants" in q:
-            endpoint = "contracts?select=*,tenants(name,email,phone)"
-            if params and len(params) == 1:
-                endpoint += f"&id=eq.{params[0]}"
-            contracts = self._fetch(endpoint)
-            self._results = [self._build_contract_row(c) for c in contracts]
-            self.description = self.CONTRACT_COLS
+    def _select_expiring(self, query, params):
+        """Contracts expiring within the look-ahead"""
+        today = date.today()
+        contracts = self._alert_rows(today, "expiring", params[0] if params else 100)
+
+        self._results = (self._build_expiring_row(c, today) for c in contracts)
+        self.description = [
+            ('contract_id',), ('property_name',), ('location',), ('start_date',), ('expiry_date',),
+            ('annual_rent',), ('num_checks',), ('payment_method',), ('agent_name',), ('agent_email',),
+            ('tenant_name',), ('tenant_email',), ('tenant_phone',), ('days_until_expiry',)
+        ]
+
+    def _build_expiring_row(self, c, today):
+        """Build expiring-contract row from API data"""
+        tenant = c.get('tenants', {})
+        days = (self._to_date(c['expiry_date']) - today).days
+        return (
+            c['id'], c['property_name'], c['location'], c['start_date'], c['expiry_date'],
+            c['annual_rent'], c['num_checks'], c['payment_method'],
+            c['agent_name'], c['agent_email'],
+            tenant.get('name'), tenant.get('email'), tenant.get('phone'), days
+        )
+
+    def _select_summary(self, query, params):
+        """Contract summary with its checks aggregated"""
+        contracts = self._fetch(f"{CONTRACTS_WITH_CHECKS}&id=eq.{params[0]}")
+        self._results = [self._build_contract_row(c) + (c.get('checks', []),) for c in contracts]
+        self.description = self.CONTRACT_COLS + [('checks',)]
 
-        # Checks for a contract
-        elif "from checks" in q and "where contract_id" in q:
-            cid = params[0] if params else None
-            checks = self._fetch(f"checks?contract_id=eq.{cid}&order=check_date.asc")
-            self._results = [(c['id'], c['check_no'], c['check_date'], c['amount']) for c in checks]
-            self.description = [('id',), ('check_no',), ('check_date',), ('amount',)]
-
-        # Overdue or upcoming checks
-        elif "from checks ch" in q and "join contracts" in q:
-            today = params[0] if params else datetime.now().date()
-            check_cols = [
-                ('check_id',), ('check_no',), ('check_date',), ('amount',), ('contract_id',),
-                ('property_name',), ('location',), ('tenant_name',), ('tenant_email',),
-                ('tenant_phone',), ('agent_name',), ('agent_email',)
-            ]
-
-            if "where ch.check_date <" in q:
-                checks = self._fetch(f"checks?select=*,contracts(property_name,location,agent_name,agent_email,tenants(name,email,phone))&check_date=lt.{today}&order=check_date.asc")
-                self._results = [self._build_check_row(ch, today) for ch in checks]
-                self.description = check_cols + [('days_overdue',)]
-            elif "where ch.check_date between" in q:
-                future = params[2] if params and len(params) >= 3 else today + timedelta(days=30)
-                checks = self._fetch(f"checks?select=*,contracts(property_name,location,agent_name,agent_email,tenants(name,email,phone))&check_date=gte.{today}&check_date=lte.{future}&order=check_date.asc")
-                self._results = [self._build_check_row(ch, today, True) for ch in checks]
-                self.description = check_cols + [('days_until_due',)]
-
-        # Expiry alerts
-        elif "where c.expiry_date between" in q:
-            today = params[1] if params and len(params) >= 2 else datetime.now().date()
-            threshold = params[2] if params and len(params) >= 3 else today + timedelta(days=100)
-            contracts = self._fetch(f"contracts?select=*,tenants(name,email,phone)&expiry_date=gte.{today}&expiry_date=lte.{threshold}&order=expiry_date.asc")
-
-            self._results = []
-            for c in contracts:
-                tenant = c.get('tenants', {})
-                days = (self._to_date(c['expiry_date']) - today).days
-                self._results.append((
-                    c['id'], c['property_name'], c['location'], c['start_date'], c['expiry_date'],
-                    c['annual_rent'], c['num_checks'], c['payment_method'],
-                    c['agent_name'], c['agent_email'],
-                    tenant.get('name'), tenant.get('email'), tenant.get('phone'), days
-                ))
-            self.description = [
-                ('contract_id',), ('property_name',), ('location',), ('start_date',), ('expiry_date',),
-                ('annual_rent',), ('num_checks',), ('payment_method',), ('agent_name',), ('agent_email',),
-                ('tenant_name',), ('tenant_email',), ('tenant_phone',), ('days_until_expiry',)
-            ]
-
-        # Generic contracts
+    def _select_contracts(self, query, params):
+        """Contracts with tenants, paginated or by id"""
+        endpoint = f"contracts?select={CONTRACT_SELECT}"
+        if "limit %s offset %s" in query.lower():
+            limit, offset = params
+            endpoint += f"&order=start_date.desc,id.desc&offset={offset}"
+            if limit is not None:
+                endpoint += f"&limit={limit}"
+        elif params and len(params) == 1:
+            endpoint += f"&id=eq.{params[0]}"
+        contracts = self._fetch(endpoint)
+        rows = (self._build_contract_row(c) for c in contracts)
+
+        # fetch_contracts may project a subset of the columns
+        fields = _select_aliases(query)
+        if fields and len(fields) < len(self.CONTRACT_COLS):
+            names = [col[0] for col in self.CONTRACT_COLS]
+            idx = [names.index(f) for f in fields]
+            self._results = (tuple(row[i] for i in idx) for row in rows)
+            self.description = [(f,) for f in fields]
         else:
-            contracts = self._fetch("contracts?select=*&order=id.asc")
-            self._results = [
-                (c['id'], self._to_date(c['start_date']), self._to_date(c['expiry_date']),
-                 c['annual_rent'], c['num_checks'])
-                for c in contracts
-            ]
-            self.description = [('id',), ('start_date',), ('expiry_date',), ('annual_rent',), ('num_checks',)]
+            self._results = rows
+            self.description = self.CONTRACT_COLS
+
+    def _select_contract_checks(self, query, params):
+        """Checks for a contract"""
+        checks = self._fetch(f"checks?select=id,check_no,check_date,amount&contract_id=eq.{params[0]}"
+                             "&order=check_date.asc")
+        self._results = ((c['id'], c['check_no'], c['check_date'], c['amount']) for c in checks)
+        self.description = [('id',), ('check_no',), ('check_date',), ('amount',)]
+
+    def _select_overdue(self, query, params):
+        """Checks dated before today"""
+        today = date.today()
+        checks = self._alert_rows(today, "overdue", None)
+        self._results = (self._build_check_row(ch, today) for ch in checks)
+        self.description = self.CHECK_COLS + [('days_overdue',)]
+
+    def _select_upcoming(self, query, params):
+        """Checks due within the look-ahead"""
+        today = date.today()
+        checks = self._alert_rows(today, "upcoming", params[0] if params else 30)
+        self._results = (self._build_check_row(ch, today, True) for ch in checks)
+        self.description = self.CHECK_COLS + [('days_until_due',)]
+
+    def _select_generic(self, query, params):
+        """Generic contracts"""
+        contracts = self._fetch("contracts?select=id,start_date,expiry_date,annual_rent,num_checks&order=id.asc")
+        self._results = [
+            (c['id'], self._to_date(c['start_date']), self._to_date(c['expiry_date']),
+             c['annual_rent'], c['num_checks'])
+            for c in contracts
+        ]
+        self.description = [('id',), ('start_date',), ('expiry_date',), ('annual_rent',), ('num_checks',)]
+
+    def _alert_rows(self, today, kind, days):
+        """Rows for an alert query, from prefetch_alerts when it covered this query"""
+        rows = self.connection.prefetched_alerts.pop((kind, days), None)
+        if rows is not None:
+            return rows
+        return self._fetch(_ALERT_ENDPOINTS[kind](today, days))
+
+    def _count(self, endpoint):
+        """Row count for a PostgREST endpoint
+
+        Sent as a HEAD request with Prefer: count=exact, so the count comes
+        back in the Content-Range header and no body is built or parsed.
+        Counts are cached for SUPABASE_CACHE_TTL seconds in _COUNT_CACHE.
+
+        Raises:
+            httpx.HTTPStatusError: If PostgREST answers with an error status
+            ValueError: If the response carries no row count
+        """
+        if SUPABASE_CACHE_TTL > 0:
+            count = _cache_get(_COUNT_CACHE, endpoint)
+            if count is not None:
+                return count
+
+        r = _HTTP.head(endpoint, headers=_COUNT_HEADERS)
+        # A failed count must not read as zero rows; raising lets the dashboard's
+        # stale-cache fallback answer instead
+        r.raise_for_status()
+        content_range = r.headers.get("content-range", "")
+        if "/" not in content_range:
+            raise ValueError(f"No row count in Content-Range {content_range!r} for {endpoint}")
+        count = int(content_range.rsplit("/", 1)[1])
+        if SUPABASE_CACHE_TTL > 0:
+            _cache_put(_COUNT_CACHE, endpoint, count)
+        return count
+
+    DASHBOARD_COLS = ('total_contracts', 'expiring_contracts', 'upcoming_payments', 'overdue_payments')
 
     def _handle_count(self, query, params):
-        """Handle COUNT queries"""
-        q = query.lower()
-        if "from checks where contract_id" in q:
-            result = self._fetch(f"checks?contract_id=eq.{params[0]}&select=count")
-            self._results = [(result[0]['count'] if result else 0,)]
-        elif "from checks where check_no" in q:
-            result = self._fetch(f"checks?check_no=eq.{params[0]}&select=id")
-            self._results = [(result[0]['id'],)] if result else []
+        """Handle the dashboard COUNT query"""
+        alert_days, days_ahead = params
+        today = date.today()
+        threshold = today + timedelta(days=alert_days)
+        future = today + timedelta(days=days_ahead)
+        endpoints = (
+            "contracts",
+            f"contracts?expiry_date=gte.{today}&expiry_date=lte.{threshold}",
+            f"checks?check_date=gte.{today}&check_date=lte.{future}",
+            f"checks?check_date=lt.{today}",
+        )
+        # The counts are independent; issue them together over the shared
+        # HTTP/2 client so they cost one round trip instead of four
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            self._results = [tuple(executor.map(self._count, endpoints))]
+        self.description = [(col,) for col in self.DASHBOARD_COLS]
+
+    def _handle_generate_checks(self, query, params):
+        """Emulate one window of the set-based check generation statement"""
+        contracts = self._fetch("contracts?select=id,start_date,expiry_date,annual_rent,num_checks"
+                                f"&id=gt.{params['after_id']}&order=id.asc&limit={params['batch_size']}", cache=False)
+        existing = []
+        if contracts:
+            ids = ','.join(str(c['id']) for c in contracts)
+            existing = self._fetch(f"checks?select=contract_id&contract_id=in.({ids})", cache=False)
+
+        counts = {}
+        for ch in existing:
+            counts[ch['contract_id']] = counts.get(ch['contract_id'], 0) + 1
+
+        rows = []
+        skipped = 0
+        for c in contracts:
+            cid, num = c['id'], c['num_checks']
+            if counts.get(cid, 0) >= num:
+                skipped += num
+                continue
+
+            start, end = self._to_date(c['start_date']), self._to_date(c['expiry_date'])
+            amount = (Decimal(str(c['annual_rent'])) / num).quantize(TWOPLACES, rounding=ROUND_HALF_UP)
+            span_days = (end - start).days
+
+            for i in range(num):
+                check_no = f"CHK{cid:03d}{i+1:02d}"
+                check_date = start + timedelta(days=span_days * i // num)
+                rows.append({"contract_id": cid, "check_no": check_no,
+                             "check_date": str(check_date), "amount": float(amount)})
+
+        # PostgREST inserts a JSON array in one request; duplicates on check_no are
+        # dropped server-side and only the inserted rows come back
+        generated = 0
+        if rows:
+            headers = {"Prefer": "resolution=ignore-duplicates,return=representation"}
+            r = _HTTP.post("checks?on_conflict=check_no&select=id", headers=headers, content=orjson.dumps(rows))
+            # A rejected insert (e.g. the unique index from migration 001 is
+            # missing) must fail the window, not be reported as skipped checks
+            r.raise_for_status()
+            generated = len(orjson.loads(r.content))
+            logger.debug(f"Bulk insert {len(rows)} checks, status: {r.status_code}")
+            self._invalidate_checks()
+
+        last_id = contracts[-1]['id'] if contracts else None
+        self._results = [(len(contracts), last_id, generated, skipped + len(rows) - generated)]
+        self.description = [('total_contracts',), ('last_contract_id',), ('checks_generated',), ('checks_skipped',)]
 
     def _handle_insert(self, query, params):
-        """Handle INSERT queries"""
-        if "into checks" in query.lower():
-            cid, check_no, check_date, amount = params
-            data = {"contract_id": cid, "check_no": check_no, "check_date": str(check_date), "amount": float(amount)}
-            r = httpx.post(f"{self.url}/checks", headers=self.headers, json=data)
-            logger.debug(f"Insert check: {check_no}, status: {r.status_code}")
+        """Handle INSERT INTO checks"""
+        cid, check_no, check_date, amount = params
+        data = {"contract_id": cid, "check_no": check_no, "check_date": str(check_date), "amount": float(amount)}
+        r = _HTTP.post("checks", content=orjson.dumps(data))
+        logger.debug(f"Insert check: {check_no}, status: {r.status_code}")
+        self._invalidate_checks()
 
     def fetchall(self):
-        return self._results
+        # The (0,) sentinel is for fetchone() only; no result set means no rows
+        if self.description is None:
+            return []
+        if self.as_dict:
+            return rows_to_dicts(self._columns, self._iter)
+        return list(self._iter)
 
     def fetchone(self):
-        if self._results and self._row_index < len(self._results):
-            result = self._results[self._row_index]
-            self._row_index += 1
-            return result
-        return (0,) if not self._results and self.description is None else None
+        row = next(self._iter, None)
+        if row is not None and self.as_dict and self.description is not None:
+            return dict(zip(self._columns, row))
+        return row
 
     def close(self):
         pass
+
+
+# Query shape -> handler, keyed by _classify
+_DISPATCH = {
+    "generate_checks": SupabaseCursor._handle_generate_checks,
+    "dashboard_counts": SupabaseCursor._handle_count,
+    "insert_check": SupabaseCursor._handle_insert,
+    "select_expiring": SupabaseCursor._select_expiring,
+    "select_summary": SupabaseCursor._select_summary,
+    "select_contracts": SupabaseCursor._select_contracts,
+    "select_contract_checks": SupabaseCursor._select_contract_checks,
+    "select_overdue": SupabaseCursor._select_overdue,
+    "select_upcoming": SupabaseCursor._select_upcoming,
+    "select_generic": SupabaseCursor._select_generic,
+}
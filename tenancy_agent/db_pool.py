@@ -0,0 +1,117 @@
+"""Process-wide PostgreSQL connection pool"""
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+import psycopg2
+from fastapi import HTTPException
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from .config import DB_CONFIG, DB_POOL_MIN, DB_POOL_MAX, DB_POOL_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# ThreadedConnectionPool raises instead of waiting when exhausted, so request
+# threads queue here for a free connection. The wait is bounded by
+# DB_POOL_TIMEOUT: waiters occupy threadpool threads that the connection
+# holders may need to finish, so an unbounded wait can deadlock the worker.
+_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """Return the shared connection pool, creating it on first use
+
+    The pool is created lazily so importing this module never opens a
+    connection, and each worker process gets its own pool after forking.
+
+    Returns:
+        ThreadedConnectionPool shared by the whole process
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX, **dict(DB_CONFIG))
+                logger.info("Database connection pool created")
+    return _pool
+
+
+def warm_pool() -> int:
+    """Open and ping the pool's minimum connections ahead of the first request
+
+    Returns:
+        Number of connections verified
+    """
+    pool = get_pool()
+    conns = []
+    try:
+        for _ in range(pool.minconn):
+            conn = pool.getconn()
+            conns.append(conn)
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+    finally:
+        for conn in conns:
+            pool.putconn(conn)
+    logger.info(f"Warmed {len(conns)} pooled connections")
+    return len(conns)
+
+
+@contextmanager
+def pooled_connection(cursor_factory=None) -> Iterator:
+    """Borrow a pooled connection for the duration of a with-block
+
+    Connections are not pinged on checkout. A connection the server has
+    dropped surfaces as OperationalError/InterfaceError on first use; it is
+    then closed instead of being returned to the pool, and the error is
+    re-raised to the caller.
+
+    Args:
+        cursor_factory: Default cursor class for conn.cursor() while borrowed
+            (e.g. RealDictCursor); reset before the connection is returned
+
+    Yields:
+        psycopg2 connection, returned to the pool when the block exits
+
+    Raises:
+        PoolError: If no connection frees up within DB_POOL_TIMEOUT seconds
+    """
+    pool = get_pool()
+    if not _slots.acquire(timeout=DB_POOL_TIMEOUT):
+        raise PoolError(f"no pooled connection free after {DB_POOL_TIMEOUT}s")
+    try:
+        conn = pool.getconn()
+        conn.cursor_factory = cursor_factory
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            logger.warning("Discarding broken pooled connection")
+            raise
+        finally:
+            conn.cursor_factory = None
+            pool.putconn(conn, close=broken or bool(conn.closed))
+    finally:
+        _slots.release()
+
+
+def get_conn() -> Iterator:
+    """FastAPI dependency yielding a pooled connection for one request
+
+    Yields:
+        psycopg2 connection, returned to the pool once the request finishes
+
+    Raises:
+        HTTPException: 503 when the pool stays exhausted
+    """
+    try:
+        with pooled_connection() as conn:
+            yield conn
+    except PoolError as e:
+        logger.warning(f"Connection pool exhausted: {str(e)}")
+        raise HTTPException(status_code=503, detail="Database busy, please retry")
@@ -1,11 +1,32 @@
 """Contract expiry email notifications"""
 import logging
+from string import Template
 from typing import Dict, Any, List
-from .email_sender import send_to_tenant_and_agent
+from .email_sender import send_to_tenant_and_agent, send_batch
 from .templates import base_email_template, info_box, contact_box
 
 logger = logging.getLogger(__name__)
 
+_TENANT_TMPL = Template("""
+        <p>Dear $tenant_name,</p>
+        <p>This is to inform you that your tenancy contract is expiring soon.</p>
+
+        $info_box
+
+        <p>Please contact your agent to discuss renewal or move-out arrangements.</p>
+
+        $contact_box
+    """)
+
+_AGENT_TMPL = Template("""
+        <p>Dear $agent_name,</p>
+        <p>The following contract is expiring in $days days:</p>
+
+        $info_box
+
+        <p>Please follow up with the tenant regarding renewal or move-out.</p>
+    """)
+
 
 def send_contract_expiry_alert(contract: Dict[str, Any]) -> bool:
     """Send contract expiry alert to tenant and agent
@@ -20,29 +41,23 @@ def send_contract_expiry_alert(contract: Dict[str, Any]) -> bool:
     subject = f"Contract Expiry Alert - {contract['property_name']}"
 
     # Tenant email content
-    tenant_content = f"""
-        <p>Dear {contract['tenant_name']},</p>
-        <p>This is to inform you that your tenancy contract is expiring soon.</p>
-
-        {info_box("Contract Details", {
+    tenant_content = _TENANT_TMPL.substitute(
+        tenant_name=contract['tenant_name'],
+        info_box=info_box("Contract Details", {
             "Property": contract['property_name'],
             "Location": contract['location'],
             "Expiry Date": contract['expiry_date'],
             "Days Until Expiry": f"{days_until_expiry} days",
             "Annual Rent": f"AED {contract['annual_rent']:,.2f}"
-        }, color="#e74c3c")}
-
-        <p>Please contact your agent to discuss renewal or move-out arrangements.</p>
-
-        {contact_box(contract['agent_name'], contract['agent_email'])}
-    """
+        }, color="#e74c3c"),
+        contact_box=contact_box(contract['agent_name'], contract['agent_email'])
+    )
 
     # Agent email content
-    agent_content = f"""
-        <p>Dear {contract['agent_name']},</p>
-        <p>The following contract is expiring in {days_until_expiry} days:</p>
-
-        {info_box("Contract Details", {
+    agent_content = _AGENT_TMPL.substitute(
+        agent_name=contract['agent_name'],
+        days=days_until_expiry,
+        info_box=info_box("Contract Details", {
             "Property": contract['property_name'],
             "Location": contract['location'],
             "Tenant": contract['tenant_name'],
@@ -50,10 +65,8 @@ def send_contract_expiry_alert(contract: Dict[str, Any]) -> bool:
             "Tenant Phone": contract['tenant_phone'],
             "Expiry Date": contract['expiry_date'],
             "Annual Rent": f"AED {contract['annual_rent']:,.2f}"
-        }, color="#e74c3c")}
-
-        <p>Please follow up with the tenant regarding renewal or move-out.</p>
-    """
+        }, color="#e74c3c")
+    )
 
     tenant_html = base_email_template("Contract Expiry Notice", tenant_content, color="#e74c3c")
     agent_html = base_email_template("Contract Expiry Alert", agent_content, color="#e74c3c")
@@ -76,13 +89,6 @@ def send_batch_contract_expiry_alerts(contracts: List[Dict[str, Any]]) -> Dict[s
     Returns:
         Dictionary with success and failure counts
     """
-    stats = {'total': len(contracts), 'success': 0, 'failed': 0}
-
-    for contract in contracts:
-        if send_contract_expiry_alert(contract):
-            stats['success'] += 1
-        else:
-            stats['failed'] += 1
-
+    stats = send_batch(send_contract_expiry_alert, contracts)
     logger.info(f"Contract expiry alerts: {stats}")
     return stats
@@ -1,15 +1,119 @@
-"""Base email sender module using SMTP"""
-import smtplib
+"""Base email sender module using SMTP
+
+smtplib and email.mime are imported on first use, so processes that import
+the package but never send mail do not load them.
+"""
 import logging
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, Callable, List, Optional
 from ..config import EMAIL_CONFIG
 
+if TYPE_CHECKING:
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+
 logger = logging.getLogger(__name__)
 
+# SMTP settings as attributes, read once at import
+_CFG = SimpleNamespace(**EMAIL_CONFIG)
+
+# Worker threads used by send_batch; sending is bound by SMTP round trips
+BATCH_WORKERS = 16
+
+# Per-thread state for batch workers: the batch's session registry and this
+# worker's own session
+_local = threading.local()
+
+
+class SmtpSession:
+    """Authenticated SMTP connection reused across messages
+
+    Connects, upgrades to TLS and logs in once; every send after that costs a
+    single message exchange. A connection dropped by the server between
+    messages is re-established once before giving up.
+
+    Usage:
+        with SmtpSession() as session:
+            session.send(msg)
+    """
+
+    def __init__(self):
+        self.server: Optional['smtplib.SMTP'] = None
+
+    def __enter__(self) -> 'SmtpSession':
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Connect, STARTTLS and log in"""
+        import smtplib
+        server = smtplib.SMTP(_CFG.smtp_server, _CFG.smtp_port)
+        try:
+            server.starttls()
+            server.login(_CFG.smtp_username, _CFG.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+
+    def send(self, msg: 'MIMEMultipart') -> None:
+        """Send a message, connecting first if needed"""
+        self._call(lambda server: server.send_message(msg))
+
+    def _call(self, action: Callable[['smtplib.SMTP'], Any]) -> None:
+        """Run action on the connection, reconnecting once if it was dropped"""
+        import smtplib
+        if self.server is None:
+            self.open()
+        try:
+            action(self.server)
+        except smtplib.SMTPServerDisconnected:
+            self.open()
+            action(self.server)
+
+    def close(self) -> None:
+        """QUIT the session, ignoring errors from an already dropped connection"""
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+        self.server = None
+
+
+def _bind_batch(sessions: List[SmtpSession], lock: threading.Lock) -> None:
+    """Thread-pool initializer attaching a worker to its batch's session registry"""
+    _local.sessions = sessions
+    _local.lock = lock
+
+
+def _batch_session() -> Optional[SmtpSession]:
+    """SMTP session of the current batch worker, created on first use
+
+    Returns:
+        The worker's session, or None when not running inside send_batch
+    """
+    sessions = getattr(_local, 'sessions', None)
+    if sessions is None:
+        return None
+
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = SmtpSession()
+        _local.session = session
+        with _local.lock:
+            sessions.append(session)
+    return session
+
 
-def send_email(to_email: str, subject: str, html_content: str, text_content: str = None) -> bool:
+def send_email(to_email: str, subject: str, html_content: str, text_content: str = None,
+               session: Optional[SmtpSession] = None) -> bool:
     """Send an email using SMTP
 
     Args:
@@ -17,14 +121,18 @@ def send_email(to_email: str, subject: str, html_content: str, text_content: str
         subject: Email subject
         html_content: HTML content of the email
         text_content: Plain text fallback (optional)
+        session: SMTP session to reuse (optional, a one-off session is used otherwise)
 
     Returns:
         True if email sent successfully, False otherwise
     """
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
     try:
         msg = MIMEMultipart('alternative')
         msg['Subject'] = subject
-        msg['From'] = EMAIL_CONFIG['from_email']
+        msg['From'] = _CFG.from_email
         msg['To'] = to_email
 
         # Add plain text version
@@ -35,10 +143,11 @@ def send_email(to_email: str, subject: str, html_content: str, text_content: str
         msg.attach(MIMEText(html_content, 'html'))
 
         # Send email
-        with smtplib.SMTP(EMAIL_CONFIG['smtp_server'], EMAIL_CONFIG['smtp_port']) as server:
-            server.starttls()
-            server.login(EMAIL_CONFIG['smtp_username'], EMAIL_CONFIG['smtp_password'])
-            server.send_message(msg)
+        if session is not None:
+            session.send(msg)
+        else:
+            with SmtpSession() as one_off:
+                one_off.send(msg)
 
         logger.info(f"Email sent successfully to {to_email}")
         return True
@@ -49,8 +158,9 @@ def send_email(to_email: str, subject: str, html_content: str, text_content: str
 
 
 def send_to_tenant_and_agent(tenant_email: str, agent_email: str, subject: str,
-                              tenant_html: str, agent_html: str) -> bool:
-    """Send emails to both tenant and agent
+                              tenant_html: str, agent_html: str,
+                              session: Optional[SmtpSession] = None) -> bool:
+    """Send emails to both tenant and agent over a single SMTP session
 
     Args:
         tenant_email: Tenant's email address
@@ -58,17 +168,64 @@ def send_to_tenant_and_agent(tenant_email: str, agent_email: str, subject: str,
         subject: Email subject
         tenant_html: HTML content for tenant
         agent_html: HTML content for agent
+        session: SMTP session to reuse (optional; defaults to the batch
+            worker's session, or a session opened just for these two emails)
 
     Returns:
         True if at least one email sent successfully
     """
-    tenant_sent = False
-    agent_sent = False
-
-    if tenant_email:
-        tenant_sent = send_email(tenant_email, subject, tenant_html)
+    if not tenant_email and not agent_email:
+        return False
 
-    if agent_email:
-        agent_sent = send_email(agent_email, subject, agent_html)
+    if session is None:
+        session = _batch_session()
+    owned = session is None
+    if owned:
+        session = SmtpSession()
+        try:
+            session.open()
+        except Exception as e:
+            logger.error(f"Failed to open SMTP session: {str(e)}")
+            return False
+
+    # Each recipient gets its own message addressed to them, even when the
+    # bodies match; only the SMTP session is shared
+    try:
+        tenant_sent = bool(tenant_email) and send_email(tenant_email, subject, tenant_html, session=session)
+        agent_sent = bool(agent_email) and send_email(agent_email, subject, agent_html, session=session)
+    finally:
+        if owned:
+            session.close()
 
     return tenant_sent or agent_sent
+
+
+def send_batch(send_one: Callable[[Dict[str, Any]], bool], items: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Send one notification per item on a pool of worker threads
+
+    Each worker logs in to SMTP once and reuses that session for every item
+    it handles; all sessions are closed when the batch finishes.
+
+    Args:
+        send_one: Function sending the notification for a single item
+        items: Items to notify about (contracts or checks)
+
+    Returns:
+        Dictionary with total, success and failure counts
+    """
+    stats = {'total': len(items), 'success': 0, 'failed': 0}
+    if not items:
+        return stats
+
+    sessions: List[SmtpSession] = []
+    try:
+        with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(items)),
+                                initializer=_bind_batch,
+                                initargs=(sessions, threading.Lock())) as executor:
+            stats['success'] = sum(executor.map(send_one, items))
+    finally:
+        for session in sessions:
+            session.close()
+
+    stats['failed'] = stats['total'] - stats['success']
+    return stats
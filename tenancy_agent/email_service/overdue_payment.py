@@ -1,11 +1,34 @@
 """Overdue payment email notifications"""
 import logging
+from string import Template
 from typing import Dict, Any, List
-from .email_sender import send_to_tenant_and_agent
+from .email_sender import send_to_tenant_and_agent, send_batch
 from .templates import base_email_template, info_box, contact_box, alert_message
 
 logger = logging.getLogger(__name__)
 
+_TENANT_TMPL = Template("""
+        <p>Dear $tenant_name,</p>
+
+        $alert
+
+        $info_box
+
+        <p>Please arrange payment immediately to avoid late fees and legal action.</p>
+
+        $contact_box
+    """)
+
+_AGENT_TMPL = Template("""
+        <p>Dear $agent_name,</p>
+
+        $alert
+
+        $info_box
+
+        <p>Please follow up with the tenant immediately.</p>
+    """)
+
 
 def send_overdue_payment_alert(check: Dict[str, Any]) -> bool:
     """Send overdue payment alert to tenant and agent
@@ -20,32 +43,25 @@ def send_overdue_payment_alert(check: Dict[str, Any]) -> bool:
     subject = f"URGENT: Overdue Payment - {check['property_name']}"
 
     # Tenant email content
-    tenant_content = f"""
-        <p>Dear {check['tenant_name']},</p>
-
-        {alert_message("This is an urgent notice regarding an overdue payment.", "danger")}
-
-        {info_box("Payment Details", {
+    tenant_content = _TENANT_TMPL.substitute(
+        tenant_name=check['tenant_name'],
+        alert=alert_message("This is an urgent notice regarding an overdue payment.", "danger"),
+        info_box=info_box("Payment Details", {
             "Property": check['property_name'],
             "Location": check['location'],
             "Check Number": check['check_no'],
             "Amount Due": f"AED {check['amount']:,.2f}",
             "Due Date": check['check_date'],
             "Days Overdue": f"{days_overdue} days"
-        }, color="#c0392b")}
-
-        <p>Please arrange payment immediately to avoid late fees and legal action.</p>
-
-        {contact_box(check['agent_name'], check['agent_email'])}
-    """
+        }, color="#c0392b"),
+        contact_box=contact_box(check['agent_name'], check['agent_email'])
+    )
 
     # Agent email content
-    agent_content = f"""
-        <p>Dear {check['agent_name']},</p>
-
-        {alert_message(f"The following payment is {days_overdue} days overdue.", "danger")}
-
-        {info_box("Payment Details", {
+    agent_content = _AGENT_TMPL.substitute(
+        agent_name=check['agent_name'],
+        alert=alert_message(f"The following payment is {days_overdue} days overdue.", "danger"),
+        info_box=info_box("Payment Details", {
             "Property": check['property_name'],
             "Location": check['location'],
             "Tenant": check['tenant_name'],
@@ -55,10 +71,8 @@ def send_overdue_payment_alert(check: Dict[str, Any]) -> bool:
             "Amount": f"AED {check['amount']:,.2f}",
             "Due Date": check['check_date'],
             "Days Overdue": f"{days_overdue} days"
-        }, color="#c0392b")}
-
-        <p>Please follow up with the tenant immediately.</p>
-    """
+        }, color="#c0392b")
+    )
 
     tenant_html = base_email_template("OVERDUE PAYMENT NOTICE", tenant_content, color="#c0392b")
     agent_html = base_email_template("Overdue Payment Alert", agent_content, color="#c0392b")
@@ -81,13 +95,6 @@ def send_batch_overdue_payment_alerts(checks: List[Dict[str, Any]]) -> Dict[str,
     Returns:
         Dictionary with success and failure counts
     """
-    stats = {'total': len(checks), 'success': 0, 'failed': 0}
-
-    for check in checks:
-        if send_overdue_payment_alert(check):
-            stats['success'] += 1
-        else:
-            stats['failed'] += 1
-
+    stats = send_batch(send_overdue_payment_alert, checks)
     logger.info(f"Overdue payment alerts: {stats}")
     return stats
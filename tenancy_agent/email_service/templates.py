@@ -1,5 +1,47 @@
 """Email HTML templates for EstateLink notifications"""
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Tuple
+
+# Border and background colors per alert type
+ALERT_COLORS = MappingProxyType({
+    "info": "#3498db",
+    "warning": "#f59e0b",
+    "danger": "#c0392b",
+    "success": "#10b981"
+})
+ALERT_BG_COLORS = MappingProxyType({
+    "info": "#dbeafe",
+    "warning": "#fff3cd",
+    "danger": "#fee",
+    "success": "#d1fae5"
+})
+
+# Static fragments of info_box, joined around the title, color and items
+_INFOBOX_OPEN = '\n    <div style="background-color: #f8f9fa; padding: 15px; border-left: 4px solid '
+_INFOBOX_MID1 = '; margin: 20px 0;">\n        <h3 style="margin-top: 0;">'
+_INFOBOX_MID2 = '</h3>\n        '
+_INFOBOX_CLOSE = '\n    </div>\n    '
+
+
+@lru_cache(maxsize=64)
+def _shell(title: str, color: str) -> Tuple[str, str]:
+    """HTML before and after the content of base_email_template"""
+    prefix = f"""
+    <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                <h2 style="color: {color};">{title}</h2>
+                """
+    suffix = """
+                <p style="margin-top: 30px; font-size: 0.9em; color: #666;">
+                    This is an automated notification from EstateLink Property Management System.
+                </p>
+            </div>
+        </body>
+    </html>
+    """
+    return prefix, suffix
 
 
 def base_email_template(title: str, content: str, color: str = "#667eea") -> str:
@@ -13,19 +55,8 @@ def base_email_template(title: str, content: str, color: str = "#667eea") -> str
     Returns:
         Complete HTML email
     """
-    return f"""
-    <html>
-        <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-            <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                <h2 style="color: {color};">{title}</h2>
-                {content}
-                <p style="margin-top: 30px; font-size: 0.9em; color: #666;">
-                    This is an automated notification from EstateLink Property Management System.
-                </p>
-            </div>
-        </body>
-    </html>
-    """
+    prefix, suffix = _shell(title, color)
+    return prefix + content + suffix
 
 
 def info_box(title: str, items: Dict[str, Any], color: str = "#3498db") -> str:
@@ -39,19 +70,14 @@ def info_box(title: str, items: Dict[str, Any], color: str = "#3498db") -> str:
     Returns:
         HTML info box
     """
-    items_html = "".join([
-        f"<p><strong>{label}:</strong> {value}</p>"
-        for label, value in items.items()
+    return "".join([
+        _INFOBOX_OPEN, color, _INFOBOX_MID1, title, _INFOBOX_MID2,
+        *(f"<p><strong>{label}:</strong> {value}</p>" for label, value in items.items()),
+        _INFOBOX_CLOSE
     ])
 
-    return f"""
-    <div style="background-color: #f8f9fa; padding: 15px; border-left: 4px solid {color}; margin: 20px 0;">
-        <h3 style="margin-top: 0;">{title}</h3>
-        {items_html}
-    </div>
-    """
-
 
+@lru_cache(maxsize=256)
 def contact_box(name: str, email: str, phone: str = None) -> str:
     """Create a contact information box
 
@@ -75,6 +101,7 @@ def contact_box(name: str, email: str, phone: str = None) -> str:
     """
 
 
+@lru_cache(maxsize=256)
 def alert_message(message: str, alert_type: str = "info") -> str:
     """Create an alert/warning message
 
@@ -85,21 +112,8 @@ def alert_message(message: str, alert_type: str = "info") -> str:
     Returns:
         HTML alert box
     """
-    colors = {
-        "info": "#3498db",
-        "warning": "#f59e0b",
-        "danger": "#c0392b",
-        "success": "#10b981"
-    }
-    bg_colors = {
-        "info": "#dbeafe",
-        "warning": "#fff3cd",
-        "danger": "#fee",
-        "success": "#d1fae5"
-    }
-
-    color = colors.get(alert_type, "#3498db")
-    bg_color = bg_colors.get(alert_type, "#dbeafe")
+    color = ALERT_COLORS.get(alert_type, "#3498db")
+    bg_color = ALERT_BG_COLORS.get(alert_type, "#dbeafe")
 
     return f"""
     <div style="padding: 15px; background-color: {bg_color}; border-left: 4px solid {color}; margin: 20px 0; border-radius: 5px;">
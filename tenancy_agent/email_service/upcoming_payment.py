@@ -1,11 +1,32 @@
 """Upcoming payment reminder email notifications"""
 import logging
+from string import Template
 from typing import Dict, Any, List
-from .email_sender import send_to_tenant_and_agent
+from .email_sender import send_to_tenant_and_agent, send_batch
 from .templates import base_email_template, info_box, contact_box
 
 logger = logging.getLogger(__name__)
 
+_TENANT_TMPL = Template("""
+        <p>Dear $tenant_name,</p>
+        <p>This is a friendly reminder that a payment is due soon.</p>
+
+        $info_box
+
+        <p>Please ensure payment is made by the due date to avoid late fees.</p>
+
+        $contact_box
+    """)
+
+_AGENT_TMPL = Template("""
+        <p>Dear $agent_name,</p>
+        <p>The following payment is due in $days days:</p>
+
+        $info_box
+
+        <p>Tenant has been notified. Please follow up if needed.</p>
+    """)
+
 
 def send_upcoming_payment_reminder(check: Dict[str, Any]) -> bool:
     """Send upcoming payment reminder to tenant and agent
@@ -20,30 +41,24 @@ def send_upcoming_payment_reminder(check: Dict[str, Any]) -> bool:
     subject = f"Payment Reminder - {check['property_name']}"
 
     # Tenant email content
-    tenant_content = f"""
-        <p>Dear {check['tenant_name']},</p>
-        <p>This is a friendly reminder that a payment is due soon.</p>
-
-        {info_box("Payment Details", {
+    tenant_content = _TENANT_TMPL.substitute(
+        tenant_name=check['tenant_name'],
+        info_box=info_box("Payment Details", {
             "Property": check['property_name'],
             "Location": check['location'],
             "Check Number": check['check_no'],
             "Amount Due": f"AED {check['amount']:,.2f}",
             "Due Date": check['check_date'],
             "Days Until Due": f"{days_until_due} days"
-        }, color="#3498db")}
-
-        <p>Please ensure payment is made by the due date to avoid late fees.</p>
-
-        {contact_box(check['agent_name'], check['agent_email'])}
-    """
+        }, color="#3498db"),
+        contact_box=contact_box(check['agent_name'], check['agent_email'])
+    )
 
     # Agent email content
-    agent_content = f"""
-        <p>Dear {check['agent_name']},</p>
-        <p>The following payment is due in {days_until_due} days:</p>
-
-        {info_box("Payment Details", {
+    agent_content = _AGENT_TMPL.substitute(
+        agent_name=check['agent_name'],
+        days=days_until_due,
+        info_box=info_box("Payment Details", {
             "Property": check['property_name'],
             "Location": check['location'],
             "Tenant": check['tenant_name'],
@@ -52,10 +67,8 @@ def send_upcoming_payment_reminder(check: Dict[str, Any]) -> bool:
             "Check Number": check['check_no'],
             "Amount": f"AED {check['amount']:,.2f}",
             "Due Date": check['check_date']
-        }, color="#3498db")}
-
-        <p>Tenant has been notified. Please follow up if needed.</p>
-    """
+        }, color="#3498db")
+    )
 
     tenant_html = base_email_template("Payment Reminder", tenant_content, color="#3498db")
     agent_html = base_email_template("Upcoming Payment Reminder", agent_content, color="#3498db")
@@ -78,13 +91,6 @@ def send_batch_upcoming_payment_reminders(checks: List[Dict[str, Any]]) -> Dict[
     Returns:
         Dictionary with success and failure counts
     """
-    stats = {'total': len(checks), 'success': 0, 'failed': 0}
-
-    for check in checks:
-        if send_upcoming_payment_reminder(check):
-            stats['success'] += 1
-        else:
-            stats['failed'] += 1
-
+    stats = send_batch(send_upcoming_payment_reminder, checks)
     logger.info(f"Upcoming payment reminders: {stats}")
     return stats
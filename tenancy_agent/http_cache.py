@@ -0,0 +1,48 @@
+"""Cache-Control and ETag headers for read-only endpoints"""
+import hashlib
+from typing import Dict
+from fastapi import FastAPI, Request, Response
+
+# Headers the middleware recomputes for the buffered body
+_REPLACED_HEADERS = (b"content-length", b"etag", b"cache-control")
+
+
+def add_http_caching(app: FastAPI, max_age: Dict[str, int]) -> None:
+    """Register middleware that makes GET responses cacheable by clients and proxies
+
+    Successful GET responses for the listed paths get a Cache-Control max-age
+    and a content-hash ETag. Requests whose If-None-Match carries the current
+    ETag receive an empty 304 instead of the body.
+
+    Args:
+        app: FastAPI application to attach the middleware to
+        max_age: Mapping of request path to max-age in seconds
+    """
+    @app.middleware("http")
+    async def http_cache(request: Request, call_next):
+        response = await call_next(request)
+        ttl = max_age.get(request.url.path)
+        if request.method != "GET" or ttl is None or response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        cache_control = f"public, max-age={ttl}"
+
+        if _etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+        # Rebuild from the raw header list so repeated headers (Set-Cookie) survive
+        cached = Response(content=body, status_code=response.status_code)
+        cached.raw_headers = [(k, v) for k, v in response.raw_headers if k not in _REPLACED_HEADERS] + [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", cache_control.encode("latin-1")),
+        ]
+        return cached
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header lists etag (or is *)"""
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
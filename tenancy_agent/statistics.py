@@ -0,0 +1,44 @@
+"""Aggregate count functions"""
+from typing import Dict
+import logging
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+
+def get_dashboard_counts(conn, alert_days: int = 100, days_ahead: int = 30) -> Dict[str, int]:
+    """Count contracts, expiring contracts, upcoming and overdue checks in one query
+
+    Args:
+        conn: Database connection object
+        alert_days: Number of days before expiry that counts as expiring (default: 100)
+        days_ahead: Number of days to look ahead for upcoming checks (default: 30)
+
+    Returns:
+        Dictionary with total_contracts, expiring_contracts, upcoming_payments
+        and overdue_payments
+
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+        cursor.execute("""
+            SELECT COUNT(*) as total_contracts,
+                   COUNT(*) FILTER (
+                       WHERE c.expiry_date BETWEEN CURRENT_DATE AND CURRENT_DATE + %s
+                   ) as expiring_contracts,
+                   (SELECT COUNT(*) FROM checks
+                    WHERE check_date BETWEEN CURRENT_DATE AND CURRENT_DATE + %s) as upcoming_payments,
+                   (SELECT COUNT(*) FROM checks WHERE check_date < CURRENT_DATE) as overdue_payments
+            FROM contracts c
+        """, (alert_days, days_ahead))
+
+        counts = dict(cursor.fetchone())
+        cursor.close()
+        logger.info(f"Dashboard counts: {counts}")
+        return counts
+    except Exception as e:
+        logger.error(f"Error fetching dashboard counts: {str(e)}")
+        raise
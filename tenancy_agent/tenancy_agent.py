@@ -7,6 +7,7 @@ It orchestrates all tenancy-related operations including:
 - Overdue and upcoming payment notifications
 """
 import logging
+import sys
 from .database import SupabaseConnection
 from .contracts import fetch_contracts, get_alerts, get_contract_summary
 from .checks import generate_checks, get_overdue_checks, get_upcoming_checks
@@ -25,7 +26,7 @@ def main():
     try:
         # Fetch all contracts
         logger.info("\n=== FETCHING CONTRACTS ===")
-        contracts = fetch_contracts(conn)
+        contracts = fetch_contracts(conn, fields=['contract_id'])
         logger.info(f"Total contracts: {len(contracts)}")
 
         # Generate payment checks
@@ -33,6 +34,9 @@ def main():
         check_stats = generate_checks(conn)
         logger.info(f"Generation stats: {check_stats}")
 
+        # Expiry, upcoming and overdue lookups are independent; fetch them together
+        conn.prefetch_alerts(alert_days=100, days_ahead=30)
+
         # Get expiry alerts
         logger.info("\n=== CHECKING CONTRACT EXPIRY ALERTS ===")
         alerts = get_alerts(conn, alert_days=100)
@@ -76,8 +80,6 @@ def main():
 
 if __name__ == "__main__":
     results = main()
-    print("\n" + "="*50)
-    print("FINAL SUMMARY")
-    print("="*50)
-    for key, value in results.items():
-        print(f"{key}: {value}")
+    rule = "=" * 50
+    lines = ["", rule, "FINAL SUMMARY", rule, *(f"{key}: {value}" for key, value in results.items())]
+    sys.stdout.write("\n".join(lines) + "\n")
@@ -1,26 +1,29 @@
 """Utility functions for data processing"""
 from datetime import timedelta
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 
 
-def rows_to_dicts(columns: List[str], rows: List[tuple], timedelta_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+def rows_to_dicts(columns: List[str], rows: Iterable[tuple], timedelta_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """Convert database rows to list of dictionaries
 
     Args:
         columns: List of column names
-        rows: List of row tuples
+        rows: Row tuples (any iterable)
         timedelta_fields: Optional list of fields to convert from timedelta to int
 
     Returns:
         List of dictionaries
     """
+    if not timedelta_fields:
+        return [dict(zip(columns, row)) for row in rows]
+
+    # Resolve the timedelta columns to row positions once, not per row
+    td_idx = [i for i, name in enumerate(columns) if name in timedelta_fields]
     result = []
     for row in rows:
-        item = dict(zip(columns, row))
-        # Convert timedelta fields to integers
-        if timedelta_fields:
-            for field in timedelta_fields:
-                if isinstance(item.get(field), timedelta):
-                    item[field] = item[field].days
-        result.append(item)
+        row = list(row)
+        for i in td_idx:
+            if isinstance(row[i], timedelta):
+                row[i] = row[i].days
+        result.append(dict(zip(columns, row)))
     return result
@@ -0,0 +1,203 @@
+"""Shared fixtures: an in-memory PostgREST for the Supabase-backed cursor"""
+import operator
+
+import httpx
+import orjson
+import pytest
+
+from tenancy_agent import database
+
+_OPS = {
+    "eq": operator.eq,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+# Query-string keys that shape the response rather than filter rows
+_RESERVED = {"select", "order", "limit", "offset", "on_conflict"}
+
+
+class FakeResponse:
+    """Just enough of httpx.Response for SupabaseCursor"""
+
+    def __init__(self, method, endpoint, status_code, data=None, headers=None):
+        self.request = httpx.Request(method, f"http://postgrest/{endpoint}")
+        self.status_code = status_code
+        self.content = orjson.dumps(data) if data is not None else b""
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise httpx.HTTPStatusError(f"{self.status_code} for {self.request.url}",
+                                        request=self.request, response=self)
+
+
+def _split_top_level(select):
+    """Split a select list on the commas outside embedded resources"""
+    parts, depth, current = [], 0, ""
+    for ch in select:
+        if ch == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += (ch == "(") - (ch == ")")
+        current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _coerce(field, value):
+    """Parse a filter value to the type of the column it is compared with"""
+    if isinstance(field, int):
+        return int(value)
+    if isinstance(field, float):
+        return float(value)
+    return value
+
+
+def _matches(row, column, condition):
+    opname, _, value = condition.partition(".")
+    if opname == "in":
+        return str(row[column]) in value.strip("()").split(",")
+    return _OPS[opname](row[column], _coerce(row[column], value))
+
+
+class FakePostgrest:
+    """In-memory tenants/contracts/checks tables answering PostgREST requests
+
+    Supports the subset the cursor sends: select with embedded tenants,
+    contracts and checks, eq/gt/gte/lt/lte/in filters, order, limit, offset,
+    HEAD counts through Content-Range, and POST to checks honouring
+    on_conflict=check_no with ignore-duplicates.
+    """
+
+    def __init__(self):
+        self.tables = {"tenants": {}, "contracts": {}, "checks": {}}
+        self.requests = []
+        # Status code to answer every request with, to simulate an outage
+        self.fail_with = None
+
+    def add_tenant(self, id, name="Tenant", email="tenant@example.com", phone="555-0100"):
+        self.tables["tenants"][id] = {"id": id, "name": name, "email": email, "phone": phone}
+
+    def add_contract(self, id, start_date, expiry_date, annual_rent, num_checks, tenant_id=1, **extra):
+        if tenant_id not in self.tables["tenants"]:
+            self.add_tenant(tenant_id)
+        self.tables["contracts"][id] = {
+            "id": id, "tenant_id": tenant_id, "property_name": f"Unit {id}", "location": "Dubai",
+            "start_date": str(start_date), "expiry_date": str(expiry_date),
+            "annual_rent": annual_rent, "num_checks": num_checks, "payment_method": "cheque",
+            "agent_name": "Agent", "agent_email": "agent@example.com", **extra,
+        }
+
+    def add_check(self, contract_id, check_no, check_date, amount):
+        checks = self.tables["checks"]
+        check_id = max(checks, default=0) + 1
+        checks[check_id] = {"id": check_id, "contract_id": contract_id, "check_no": check_no,
+                            "check_date": str(check_date), "amount": amount}
+        return check_id
+
+    def checks_for(self, contract_id):
+        """Stored checks of a contract, in check number order"""
+        return sorted((ch for ch in self.tables["checks"].values() if ch["contract_id"] == contract_id),
+                      key=lambda ch: ch["check_no"])
+
+    def hits(self, prefix):
+        """Requests made so far whose endpoint starts with prefix"""
+        return [endpoint for _, endpoint in self.requests if endpoint.startswith(prefix)]
+
+    def _query(self, endpoint):
+        table, _, query = endpoint.partition("?")
+        params = [p.split("=", 1) for p in query.split("&") if p]
+        rows = sorted(self.tables[table].values(), key=lambda r: r["id"])
+
+        for key, value in params:
+            if key not in _RESERVED and "." not in key:
+                rows = [r for r in rows if _matches(r, key, value)]
+
+        options = dict(p for p in params if p[0] in _RESERVED)
+        for part in reversed([p for p in options.get("order", "").split(",") if p]):
+            column, _, direction = part.partition(".")
+            rows.sort(key=lambda r: r[column], reverse=direction == "desc")
+        offset = int(options.get("offset", 0))
+        rows = rows[offset:]
+        if "limit" in options:
+            rows = rows[:int(options["limit"])]
+        return table, rows, options.get("select")
+
+    def _embed(self, table, row, column):
+        name, _, inner = column.partition("(")
+        inner = inner[:-1]
+        if name == "tenants":
+            return self._shape("tenants", self.tables["tenants"].get(row["tenant_id"]), inner)
+        if name == "contracts":
+            return self._shape("contracts", self.tables["contracts"].get(row["contract_id"]), inner)
+        if name == "checks":
+            checks = sorted((ch for ch in self.tables["checks"].values() if ch["contract_id"] == row["id"]),
+                            key=lambda ch: ch["check_date"])
+            return [self._shape("checks", ch, inner) for ch in checks]
+        raise AssertionError(f"unexpected embed {name} on {table}")
+
+    def _shape(self, table, row, select):
+        if row is None or not select or select == "*":
+            return row
+        shaped = {}
+        for column in _split_top_level(select):
+            if "(" in column:
+                shaped[column.partition("(")[0]] = self._embed(table, row, column)
+            else:
+                shaped[column] = row[column]
+        return shaped
+
+    def get(self, endpoint, **kwargs):
+        self.requests.append(("GET", endpoint))
+        if self.fail_with:
+            return FakeResponse("GET", endpoint, self.fail_with, {"message": "unavailable"})
+        table, rows, select = self._query(endpoint)
+        return FakeResponse("GET", endpoint, 200, [self._shape(table, r, select) for r in rows])
+
+    def head(self, endpoint, headers=None, **kwargs):
+        self.requests.append(("HEAD", endpoint))
+        if self.fail_with:
+            return FakeResponse("HEAD", endpoint, self.fail_with)
+        _, rows, _ = self._query(endpoint)
+        content_range = f"0-0/{len(rows)}" if rows else "*/0"
+        return FakeResponse("HEAD", endpoint, 206 if rows else 200, headers={"content-range": content_range})
+
+    def post(self, endpoint, headers=None, content=None, **kwargs):
+        self.requests.append(("POST", endpoint))
+        if self.fail_with:
+            return FakeResponse("POST", endpoint, self.fail_with, {"message": "unavailable"})
+        table, _, query = endpoint.partition("?")
+        assert table == "checks", f"unexpected insert into {table}"
+        body = orjson.loads(content)
+        ignore_duplicates = "on_conflict=check_no" in query and "ignore-duplicates" in (headers or {}).get("Prefer", "")
+        taken = {ch["check_no"] for ch in self.tables["checks"].values()}
+
+        inserted = []
+        for row in body if isinstance(body, list) else [body]:
+            if row["check_no"] in taken:
+                if ignore_duplicates:
+                    continue
+                return FakeResponse("POST", endpoint, 409, {"message": "duplicate key value"})
+            taken.add(row["check_no"])
+            inserted.append({"id": self.add_check(**row)})
+        return FakeResponse("POST", endpoint, 201, inserted)
+
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    """Route the Supabase cursor to a fresh FakePostgrest with empty caches"""
+    fake = FakePostgrest()
+    monkeypatch.setattr(database, "_HTTP", fake)
+    monkeypatch.setattr(database, "_CACHE", {})
+    monkeypatch.setattr(database, "_COUNT_CACHE", {})
+    return fake
+
+
+@pytest.fixture
+def conn(postgrest):
+    return database.SupabaseConnection()
@@ -0,0 +1,115 @@
+"""Redis read-through cache with stale fallback"""
+from decimal import Decimal
+
+import orjson
+import pytest
+import redis
+
+from tenancy_agent import cache
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the GET/SETEX pipeline calls cache.py makes"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.down = False
+
+    def get(self, key):
+        if self.down:
+            raise redis.ConnectionError("connection refused")
+        return self.data.get(key)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    def execute(self):
+        if self.client.down:
+            raise redis.ConnectionError("connection refused")
+        for key, ttl, value in self.commands:
+            self.client.data[key] = value
+            self.client.ttls[key] = ttl
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(cache, "_client", client)
+    return client
+
+
+def loader_returning(value):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return value
+
+    loader.calls = calls
+    return loader
+
+
+def failing_loader():
+    raise RuntimeError("database down")
+
+
+def test_hit_skips_the_loader(fake_redis):
+    fake_redis.data["stats:v1"] = orjson.dumps({"total": 3})
+    loader = loader_returning({"total": 9})
+
+    assert cache.cached("stats:v1", 60, loader) == {"total": 3}
+    assert loader.calls == []
+
+
+def test_miss_loads_and_stores_fresh_and_stale_copies(fake_redis):
+    loader = loader_returning({"rent": Decimal("1200.50")})
+
+    assert cache.cached("stats:v1", 60, loader) == {"rent": Decimal("1200.50")}
+    assert orjson.loads(fake_redis.data["stats:v1"]) == {"rent": 1200.5}
+    assert fake_redis.data["stale:stats:v1"] == fake_redis.data["stats:v1"]
+    assert fake_redis.ttls == {"stats:v1": 60, "stale:stats:v1": cache.STALE_TTL}
+
+
+def test_loader_failure_serves_stale_copy(fake_redis):
+    fake_redis.data["stale:stats:v1"] = orjson.dumps({"total": 3})
+
+    assert cache.cached("stats:v1", 60, failing_loader) == {"total": 3}
+
+
+def test_loader_failure_without_stale_copy_raises(fake_redis):
+    with pytest.raises(RuntimeError, match="database down"):
+        cache.cached("stats:v1", 60, failing_loader)
+
+
+def test_redis_down_falls_through_to_loader(fake_redis):
+    fake_redis.down = True
+    loader = loader_returning({"total": 9})
+
+    assert cache.cached("stats:v1", 60, loader) == {"total": 9}
+    assert loader.calls == [1]
+
+
+def test_redis_down_and_loader_failure_raises_loader_error(fake_redis):
+    fake_redis.down = True
+
+    with pytest.raises(RuntimeError, match="database down"):
+        cache.cached("stats:v1", 60, failing_loader)
+
+
+def test_no_redis_configured_always_loads(monkeypatch):
+    monkeypatch.setattr(cache, "_client", None)
+    loader = loader_returning([1, 2])
+
+    assert cache.cached("stats:v1", 60, loader) == [1, 2]
+    assert cache.cached("stats:v1", 60, loader) == [1, 2]
+    assert loader.calls == [1, 1]
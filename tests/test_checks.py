@@ -0,0 +1,89 @@
+"""generate_checks against the Supabase cursor and an in-memory PostgREST"""
+from datetime import date
+
+import httpx
+import pytest
+
+from tenancy_agent.checks import generate_checks
+
+from conftest import FakeResponse
+
+
+def test_check_numbers_pad_contract_id_to_at_least_three_digits(postgrest, conn):
+    postgrest.add_contract(7, date(2025, 1, 1), date(2026, 1, 1), 24000, 2)
+    postgrest.add_contract(1234, date(2025, 1, 1), date(2026, 1, 1), 24000, 2)
+
+    generate_checks(conn)
+
+    assert [ch["check_no"] for ch in postgrest.checks_for(7)] == ["CHK00701", "CHK00702"]
+    assert [ch["check_no"] for ch in postgrest.checks_for(1234)] == ["CHK123401", "CHK123402"]
+
+
+def test_check_dates_spread_evenly_from_start_date(postgrest, conn):
+    postgrest.add_contract(1, date(2025, 1, 1), date(2026, 1, 1), 120000, 4)
+
+    generate_checks(conn)
+
+    # start_date + 365 * i // 4 days
+    assert [ch["check_date"] for ch in postgrest.checks_for(1)] == [
+        "2025-01-01", "2025-04-02", "2025-07-02", "2025-10-01",
+    ]
+
+
+@pytest.mark.parametrize("annual_rent, num_checks, amount", [
+    (120000, 4, 30000.00),
+    (100000, 3, 33333.33),
+    (100000.01, 2, 50000.01),
+    # 12500.125 rounds half away from zero, like round() on numeric
+    (100001, 8, 12500.13),
+])
+def test_check_amounts_are_rent_split_to_two_places(postgrest, conn, annual_rent, num_checks, amount):
+    postgrest.add_contract(1, date(2025, 1, 1), date(2026, 1, 1), annual_rent, num_checks)
+
+    generate_checks(conn)
+
+    assert [ch["amount"] for ch in postgrest.checks_for(1)] == [amount] * num_checks
+
+
+def test_second_run_skips_every_expected_check(postgrest, conn):
+    postgrest.add_contract(1, date(2025, 1, 1), date(2026, 1, 1), 120000, 4)
+    postgrest.add_contract(2, date(2025, 3, 1), date(2026, 3, 1), 60000, 2)
+
+    first = generate_checks(conn)
+    second = generate_checks(conn)
+
+    assert first == {'total_contracts': 2, 'checks_generated': 6, 'checks_skipped': 0}
+    assert second == {'total_contracts': 2, 'checks_generated': 0, 'checks_skipped': 6}
+    assert len(postgrest.tables["checks"]) == 6
+
+
+def test_partially_checked_contract_only_gets_the_missing_checks(postgrest, conn):
+    postgrest.add_contract(1, date(2025, 1, 1), date(2026, 1, 1), 120000, 4)
+    postgrest.add_check(1, "CHK00101", "2025-01-01", 30000.0)
+    postgrest.add_check(1, "CHK00103", "2025-07-02", 30000.0)
+
+    stats = generate_checks(conn)
+
+    assert stats == {'total_contracts': 1, 'checks_generated': 2, 'checks_skipped': 2}
+    assert [ch["check_no"] for ch in postgrest.checks_for(1)] == ["CHK00101", "CHK00102", "CHK00103", "CHK00104"]
+
+
+def test_windows_cover_every_contract_once(postgrest, conn):
+    for cid in (3, 5, 8):
+        postgrest.add_contract(cid, date(2025, 1, 1), date(2026, 1, 1), 12000, 1)
+
+    stats = generate_checks(conn, batch_size=2)
+
+    assert stats == {'total_contracts': 3, 'checks_generated': 3, 'checks_skipped': 0}
+    assert [e for e in postgrest.hits("contracts?") if "limit=2" in e] == [
+        "contracts?select=id,start_date,expiry_date,annual_rent,num_checks&id=gt.0&order=id.asc&limit=2",
+        "contracts?select=id,start_date,expiry_date,annual_rent,num_checks&id=gt.5&order=id.asc&limit=2",
+    ]
+
+
+def test_rejected_insert_fails_the_run(postgrest, conn):
+    postgrest.add_contract(1, date(2025, 1, 1), date(2026, 1, 1), 120000, 4)
+    postgrest.post = lambda endpoint, **kwargs: FakeResponse("POST", endpoint, 400, {"message": "no unique index"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        generate_checks(conn)
@@ -0,0 +1,60 @@
+"""SupabaseCursor response caching: invalidation on insert and the size bound"""
+from datetime import date, timedelta
+
+from tenancy_agent import database
+from tenancy_agent.checks import generate_checks, get_overdue_checks, get_upcoming_checks
+from tenancy_agent.contracts import fetch_contracts, get_contract_summary
+
+
+def test_repeat_reads_are_served_from_cache(postgrest, conn):
+    postgrest.add_contract(1, date(2025, 1, 1), date(2026, 1, 1), 12000, 1)
+
+    fetch_contracts(conn, limit=10)
+    fetch_contracts(conn, limit=10)
+
+    assert len(postgrest.hits("contracts?")) == 1
+
+
+def test_generating_checks_invalidates_summary_overdue_and_upcoming(postgrest, conn):
+    today = date.today()
+    # Four quarterly checks, 80 days ago and in 11, 102 and 193 days
+    postgrest.add_contract(1, today - timedelta(days=80), today + timedelta(days=285), 120000, 4)
+
+    assert get_contract_summary(conn, 1)['checks'] == []
+    assert get_overdue_checks(conn) == []
+    assert get_upcoming_checks(conn, days_ahead=30) == []
+    requests_before = len(postgrest.requests)
+
+    # Cached: nothing new goes out
+    get_contract_summary(conn, 1)
+    get_overdue_checks(conn)
+    get_upcoming_checks(conn, days_ahead=30)
+    assert len(postgrest.requests) == requests_before
+
+    assert generate_checks(conn)['checks_generated'] == 4
+
+    assert len(get_contract_summary(conn, 1)['checks']) == 4
+    assert len(get_overdue_checks(conn)) == 1
+    assert len(get_upcoming_checks(conn, days_ahead=30)) == 1
+
+
+def test_cache_never_grows_past_its_bound(postgrest, conn):
+    postgrest.add_contract(1, date(2025, 1, 1), date(2026, 1, 1), 12000, 1)
+
+    for offset in range(database._CACHE_MAX + 50):
+        fetch_contracts(conn, limit=1, offset=offset)
+
+    assert len(database._CACHE) == database._CACHE_MAX
+    # Oldest entries go first; the latest page is still cached
+    assert any(f"offset={database._CACHE_MAX + 49}&" in endpoint for endpoint in database._CACHE)
+    assert not any("offset=0&" in endpoint for endpoint in database._CACHE)
+
+
+def test_count_cache_never_grows_past_its_bound():
+    cache = {}
+
+    for i in range(database._CACHE_MAX * 2):
+        database._cache_put(cache, f"checks?id=eq.{i}", i)
+
+    assert len(cache) == database._CACHE_MAX
+    assert database._cache_get(cache, f"checks?id=eq.{database._CACHE_MAX * 2 - 1}") == database._CACHE_MAX * 2 - 1
@@ -0,0 +1,144 @@
+"""SMTP sessions and batch sending against a fake smtplib.SMTP"""
+import smtplib
+import threading
+
+import pytest
+
+from tenancy_agent.email_service import email_sender
+from tenancy_agent.email_service.email_sender import SmtpSession, send_batch, send_to_tenant_and_agent
+
+
+class FakeSMTP:
+    """Records connections, logins and messages instead of talking to a server"""
+
+    instances = []
+    lock = threading.Lock()
+    # Messages each connection accepts before the server drops it
+    drop_after = None
+
+    def __init__(self, host, port):
+        self.logins = 0
+        self.sent = []
+        self.closed = False
+        with self.lock:
+            self.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def send_message(self, msg):
+        if self.closed or (self.drop_after is not None and len(self.sent) >= self.drop_after):
+            self.closed = True
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(msg)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, "instances", [])
+    monkeypatch.setattr(FakeSMTP, "drop_after", None)
+    return FakeSMTP
+
+
+def sent_messages(smtp):
+    return [msg for server in smtp.instances for msg in server.sent]
+
+
+def test_tenant_and_agent_each_get_their_own_message(smtp):
+    assert send_to_tenant_and_agent("tenant@example.com", "agent@example.com", "Reminder",
+                                    "<p>same</p>", "<p>same</p>")
+
+    assert len(smtp.instances) == 1
+    assert [msg["To"] for msg in sent_messages(smtp)] == ["tenant@example.com", "agent@example.com"]
+    assert smtp.instances[0].closed
+
+
+def test_tenant_and_agent_bodies_can_differ(smtp):
+    assert send_to_tenant_and_agent("tenant@example.com", "agent@example.com", "Reminder",
+                                    "<p>tenant</p>", "<p>agent</p>")
+
+    bodies = [msg.get_payload()[0].get_payload() for msg in sent_messages(smtp)]
+    assert bodies == ["<p>tenant</p>", "<p>agent</p>"]
+
+
+def test_missing_address_only_sends_to_the_other(smtp):
+    assert send_to_tenant_and_agent("", "agent@example.com", "Reminder", "<p>t</p>", "<p>a</p>")
+
+    assert [msg["To"] for msg in sent_messages(smtp)] == ["agent@example.com"]
+
+
+def test_session_logs_in_once_for_many_messages(smtp):
+    with SmtpSession() as session:
+        for i in range(3):
+            assert email_sender.send_email(f"t{i}@example.com", "Hi", "<p>x</p>", session=session)
+
+    assert len(smtp.instances) == 1
+    assert smtp.instances[0].logins == 1
+    assert len(smtp.instances[0].sent) == 3
+    assert smtp.instances[0].closed
+
+
+def test_session_reconnects_after_server_disconnect(smtp):
+    smtp.drop_after = 1
+
+    with SmtpSession() as session:
+        assert email_sender.send_email("a@example.com", "Hi", "<p>x</p>", session=session)
+        assert email_sender.send_email("b@example.com", "Hi", "<p>x</p>", session=session)
+
+    assert len(smtp.instances) == 2
+    assert [msg["To"] for msg in sent_messages(smtp)] == ["a@example.com", "b@example.com"]
+
+
+def test_session_gives_up_after_one_reconnect(smtp):
+    smtp.drop_after = 0
+
+    with SmtpSession() as session:
+        assert not email_sender.send_email("a@example.com", "Hi", "<p>x</p>", session=session)
+
+    assert len(smtp.instances) == 2
+
+
+def notify(item):
+    return send_to_tenant_and_agent(item["tenant_email"], item["agent_email"], "Reminder",
+                                    "<p>tenant</p>", "<p>agent</p>")
+
+
+def test_batch_logs_in_once_per_worker_and_closes_sessions(smtp, monkeypatch):
+    monkeypatch.setattr(email_sender, "BATCH_WORKERS", 4)
+    items = [{"tenant_email": f"t{i}@example.com", "agent_email": f"a{i}@example.com"} for i in range(40)]
+
+    stats = send_batch(notify, items)
+
+    assert stats == {'total': 40, 'success': 40, 'failed': 0}
+    assert 1 <= len(smtp.instances) <= 4
+    assert all(server.logins == 1 for server in smtp.instances)
+    assert all(server.closed for server in smtp.instances)
+    assert len(sent_messages(smtp)) == 80
+
+
+def test_batch_counts_failed_items(smtp):
+    items = [
+        {"tenant_email": "t1@example.com", "agent_email": "a1@example.com"},
+        {"tenant_email": "", "agent_email": ""},
+        {"tenant_email": "t3@example.com", "agent_email": ""},
+    ]
+
+    stats = send_batch(notify, items)
+
+    assert stats == {'total': 3, 'success': 2, 'failed': 1}
+    assert all(server.closed for server in smtp.instances)
+
+
+def test_empty_batch_opens_no_connection(smtp):
+    assert send_batch(notify, []) == {'total': 0, 'success': 0, 'failed': 0}
+    assert smtp.instances == []
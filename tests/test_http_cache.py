@@ -0,0 +1,102 @@
+"""Cache-Control/ETag middleware"""
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+import pytest
+
+from tenancy_agent.http_cache import add_http_caching
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    add_http_caching(app, {"/cached": 60, "/cookies": 60, "/missing": 60})
+
+    @app.get("/cached")
+    def cached():
+        return {"value": 1}
+
+    @app.post("/cached")
+    def post_cached():
+        return {"value": 2}
+
+    @app.get("/plain")
+    def plain():
+        return {"value": 3}
+
+    @app.get("/cookies")
+    def cookies(response: Response):
+        response.set_cookie("a", "1")
+        response.set_cookie("b", "2")
+        return {"value": 4}
+
+    @app.get("/missing")
+    def missing():
+        return Response(status_code=404)
+
+    return TestClient(app)
+
+
+def test_get_gets_etag_and_cache_control(client):
+    r = client.get("/cached")
+
+    assert r.status_code == 200
+    assert r.json() == {"value": 1}
+    assert r.headers["cache-control"] == "public, max-age=60"
+    assert r.headers["etag"].startswith('"') and r.headers["etag"].endswith('"')
+    assert r.headers["content-length"] == str(len(r.content))
+
+
+def test_matching_if_none_match_answers_empty_304(client):
+    etag = client.get("/cached").headers["etag"]
+
+    r = client.get("/cached", headers={"If-None-Match": f'"other", {etag}'})
+
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+    assert r.headers["cache-control"] == "public, max-age=60"
+
+
+def test_star_if_none_match_answers_304(client):
+    assert client.get("/cached", headers={"If-None-Match": "*"}).status_code == 304
+
+
+@pytest.mark.parametrize("if_none_match", ['"other"', 'W/{etag}', '{etag}-gzip'])
+def test_other_or_weak_tags_get_the_full_body(client, if_none_match):
+    etag = client.get("/cached").headers["etag"]
+
+    r = client.get("/cached", headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert r.status_code == 200
+    assert r.json() == {"value": 1}
+
+
+def test_unconfigured_path_is_untouched(client):
+    r = client.get("/plain")
+
+    assert r.status_code == 200
+    assert "etag" not in r.headers
+    assert "cache-control" not in r.headers
+
+
+def test_non_get_is_untouched(client):
+    r = client.post("/cached")
+
+    assert r.status_code == 200
+    assert "etag" not in r.headers
+
+
+def test_error_response_is_untouched(client):
+    r = client.get("/missing")
+
+    assert r.status_code == 404
+    assert "etag" not in r.headers
+
+
+def test_repeated_set_cookie_headers_are_kept(client):
+    r = client.get("/cookies")
+
+    cookies = r.headers.get_list("set-cookie")
+    assert len(cookies) == 2
+    assert cookies[0].startswith("a=1") and cookies[1].startswith("b=2")
+    assert "etag" in r.headers
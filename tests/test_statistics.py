@@ -0,0 +1,36 @@
+"""get_dashboard_counts against the Supabase cursor"""
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from tenancy_agent.statistics import get_dashboard_counts
+
+from conftest import FakeResponse
+
+
+def test_counts_come_from_content_range(postgrest, conn):
+    today = date.today()
+    postgrest.add_contract(1, today - timedelta(days=300), today + timedelta(days=60), 12000, 2)
+    postgrest.add_contract(2, today - timedelta(days=100), today + timedelta(days=265), 12000, 2)
+    postgrest.add_check(1, "CHK00101", today - timedelta(days=10), 6000.0)
+    postgrest.add_check(1, "CHK00102", today + timedelta(days=5), 6000.0)
+    postgrest.add_check(2, "CHK00201", today + timedelta(days=90), 6000.0)
+
+    assert get_dashboard_counts(conn) == {
+        'total_contracts': 2, 'expiring_contracts': 1, 'upcoming_payments': 1, 'overdue_payments': 1,
+    }
+
+
+def test_failed_count_raises_instead_of_reading_zero(postgrest, conn):
+    postgrest.fail_with = 503
+
+    with pytest.raises(httpx.HTTPStatusError):
+        get_dashboard_counts(conn)
+
+
+def test_count_without_content_range_raises(postgrest, conn):
+    postgrest.head = lambda endpoint, **kwargs: FakeResponse("HEAD", endpoint, 200)
+
+    with pytest.raises(ValueError):
+        get_dashboard_counts(conn)